@@ -1,28 +1,193 @@
 """
 電信產業自動摘要系統 - Gemini 分析模組
 """
+import hashlib
 import json
 import logging
+import os
 import re
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional
 
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
+# orjson 為可選依賴；未安裝時使用標準庫 json
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from config import (
     GEMINI_MODEL,
     GEMINI_MAX_RETRIES,
     GEMINI_RETRY_DELAY,
     GEMINI_PROMPT_TEMPLATE,
+    GEMINI_PROMPT_PLACEHOLDER,
     GEMINI_RANKING_PROMPT,
+    GEMINI_CACHE_DIR,
+    GEMINI_RANKING_CACHE_TTL,
 )
 
 logger = logging.getLogger(__name__)
 
+# 分析提示詞的前後段（新聞內容插入兩者之間）
+_PROMPT_PREFIX, _PROMPT_SUFFIX = GEMINI_PROMPT_TEMPLATE.split(GEMINI_PROMPT_PLACEHOLDER)
+
+# 用於從任意位置解析單一 JSON 物件
+_JSON_DECODER = json.JSONDecoder()
+
+# 串流時追蹤 JSON 結構所需的字元
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+# 依優先級排序用的 key
+_PRIORITY_KEY = attrgetter('priority')
+
+# 標題排序結果快取檔（key 為模型與完整提示詞的 hash）
+_RANKING_CACHE_FILE = os.path.join(GEMINI_CACHE_DIR, "ranking.json")
+
+# 新聞項目必要欄位
+_REQUIRED_FIELDS = frozenset(['title_zh', 'title_en', 'summary_zh', 'source', 'url', 'category', 'priority'])
+
+# 有效類別
+_VALID_CATEGORIES = frozenset(['ericsson', 'ran', 'core', 'tech', 'business', 'taiwan', 'other'])
+
+# 有效標籤（小寫 → 標準寫法）
+_BADGE_LOOKUP = {
+    badge.lower(): badge
+    for badge in ['Ericsson', 'Taiwan', 'RAN', 'Core', 'Tech', 'Business', 'Partnership', 'M&A']
+}
+
+
+def _parse_retry_delay(details) -> Optional[float]:
+    """
+    從 API 錯誤內容中取出伺服器建議的重試等待秒數（RetryInfo.retryDelay）
+
+    Args:
+        details: APIError.details（API 回傳的錯誤 JSON）
+
+    Returns:
+        Optional[float]: 等待秒數，未提供則為 None
+    """
+    try:
+        for detail in details['error']['details']:
+            if detail.get('@type', '').endswith('RetryInfo'):
+                return float(detail['retryDelay'].rstrip('s'))
+    except (KeyError, TypeError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _get_retry_delay(error: Exception) -> Optional[float]:
+    """
+    依錯誤類型決定重試前的等待秒數
+
+    Args:
+        error: 呼叫 Gemini 時發生的例外
+
+    Returns:
+        Optional[float]: 等待秒數；None 表示為永久性錯誤，不應重試
+    """
+    if isinstance(error, genai_errors.ClientError):
+        # 429 為配額限制，優先採用伺服器建議的等待時間
+        if error.code == 429:
+            return _parse_retry_delay(error.details) or GEMINI_RETRY_DELAY
+        # 其他 4xx（參數錯誤、金鑰無效、權限不足等）重試也不會成功
+        return None
+    return GEMINI_RETRY_DELAY
+
+
+def _iter_fenced_blocks(text: str, fence: str) -> Iterator[str]:
+    """
+    依序產生 ``` 區塊內容（逐一掃描，不預先建立完整列表）
+
+    Args:
+        text: 回應文字
+        fence: 開頭標記，例如 ```json
+
+    Yields:
+        str: 區塊內容
+    """
+    start = text.find(fence)
+    while start >= 0:
+        start += len(fence)
+        end = text.find('```', start)
+        if end < 0:
+            return
+        yield text[start:end]
+        start = text.find(fence, end + 3)
+
+
+def _ranking_entry_fresh(entry, now: float) -> bool:
+    """
+    標題排序快取項目是否為有效格式且未過期
+
+    cached_at 晚於現在（時鐘偏差）也視為無效，避免項目永不過期
+    """
+    if not isinstance(entry, dict):
+        return False
+    cached_at = entry.get("cached_at")
+    if not isinstance(cached_at, (int, float)):
+        return False
+    return 0 <= now - cached_at <= GEMINI_RANKING_CACHE_TTL
+
+
+class _BraceTracker:
+    """
+    串流時追蹤 JSON 大括號深度（忽略字串內的括號），判斷何時可能已收到完整物件
+
+    只掃描新進的片段，整體為線性時間
+    """
+    __slots__ = ('depth', 'in_string', 'escaped', 'offset', 'start')
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False  # 上一個片段以字串內的反斜線結尾
+        self.offset = 0  # 已處理的字元數
+        self.start = 0  # 目前最外層物件 { 的位置
 
-@dataclass
+    def feed(self, text: str) -> Optional[int]:
+        """
+        處理新片段
+
+        Returns:
+            Optional[int]: 此片段中最後一個結束的最外層物件起點（於完整回應中的位置），沒有則為 None
+        """
+        closed = None
+        skip_at = 0 if self.escaped else -1
+        self.escaped = False
+        for match in _JSON_TOKEN_RE.finditer(text):
+            pos = match.start()
+            if pos == skip_at:
+                continue
+            char = match.group()
+            if self.in_string:
+                if char == '\\':
+                    if pos + 1 == len(text):
+                        self.escaped = True
+                    skip_at = pos + 1
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.depth:
+                    self.in_string = True
+            elif char == '{':
+                if not self.depth:
+                    self.start = self.offset + pos
+                self.depth += 1
+            elif char == '}' and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    closed = self.start
+        self.offset += len(text)
+        return closed
+
+
+@dataclass(slots=True)
 class AnalyzedNews:
     """分析後的新聞項目"""
     title_zh: str
@@ -38,21 +203,14 @@ class AnalyzedNews:
 
     def to_dict(self) -> Dict:
         """轉換為字典"""
-        return {
-            "title_zh": self.title_zh,
-            "title_en": self.title_en,
-            "summary_zh": self.summary_zh,
-            "key_quote": self.key_quote,
-            "source": self.source,
-            "url": self.url,
-            "tags": self.tags,
-            "badges": self.badges,
-            "category": self.category,
-            "priority": self.priority,
-        }
-
-
-@dataclass
+        return {name: getattr(self, name) for name in _ANALYZED_NEWS_FIELDS}
+
+
+# AnalyzedNews 欄位名稱（依宣告順序）
+_ANALYZED_NEWS_FIELDS = tuple(f.name for f in fields(AnalyzedNews))
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Gemini 分析結果"""
     success: bool
@@ -90,6 +248,13 @@ class GeminiAnalyzer:
         """
         prompt = GEMINI_RANKING_PROMPT.format(titles=titles_text)
 
+        # 相同的標題列表（含順序，索引才會對應）在有效期限內直接沿用上次結果
+        cache_key = hashlib.blake2b(f"{self.model_name}\n{prompt}".encode(), digest_size=16).hexdigest()
+        cached = self._load_cached_ranking(cache_key, total_count)
+        if cached is not None:
+            logger.info(f"Using cached Gemini ranking ({len(cached)} news items)")
+            return cached
+
         for attempt in range(GEMINI_MAX_RETRIES):
             try:
                 logger.info(f"Calling Gemini API for ranking (attempt {attempt + 1}/{GEMINI_MAX_RETRIES})")
@@ -117,19 +282,102 @@ class GeminiAnalyzer:
                 valid_indices = [i for i in selected if isinstance(i, int) and 0 <= i < total_count]
 
                 logger.info(f"Gemini selected {len(valid_indices)} news items")
-                return valid_indices[:15]
+                selected_indices = valid_indices[:15]
+                if selected_indices:
+                    self._save_cached_ranking(cache_key, selected_indices)
+                return selected_indices
 
             except Exception as e:
                 error_msg = f"Gemini ranking error (attempt {attempt + 1}): {e}"
                 logger.error(error_msg)
 
+                delay = _get_retry_delay(e)
+                if delay is None:
+                    break
+
                 if attempt < GEMINI_MAX_RETRIES - 1:
-                    logger.info(f"Retrying in {GEMINI_RETRY_DELAY} seconds...")
-                    time.sleep(GEMINI_RETRY_DELAY)
+                    logger.info(f"Retrying in {delay} seconds...")
+                    time.sleep(delay)
 
         logger.warning("Gemini ranking failed after all retries")
         return []
 
+    def _load_cached_ranking(self, cache_key: str, total_count: int) -> Optional[List[int]]:
+        """
+        讀取未過期的標題排序快取
+
+        Args:
+            cache_key: 快取 key
+            total_count: 新聞總數（索引須在範圍內）
+
+        Returns:
+            Optional[List[int]]: 快取的索引列表，沒有、已過期或格式不符則為 None
+        """
+        try:
+            with open(_RANKING_CACHE_FILE, "r", encoding="utf-8") as f:
+                entry = json.load(f).get(cache_key)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+        # 格式不符（舊格式或手動修改）或已過期的項目視為沒有快取
+        if not _ranking_entry_fresh(entry, time.time()):
+            return None
+
+        selected = entry.get("selected")
+        if not isinstance(selected, list):
+            return None
+        # 與即時排序相同的索引檢查，避免損毀的快取讓後續取用新聞時出錯
+        valid_indices = [i for i in selected if isinstance(i, int) and 0 <= i < total_count][:15]
+        return valid_indices or None
+
+    def _save_cached_ranking(self, cache_key: str, selected: List[int]) -> None:
+        """
+        寫入標題排序快取（同時清除過期項目）
+
+        Args:
+            cache_key: 快取 key
+            selected: 選中的新聞索引列表
+        """
+        now = time.time()
+        try:
+            with open(_RANKING_CACHE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if not isinstance(cache, dict):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+
+        cache = {key: entry for key, entry in cache.items() if _ranking_entry_fresh(entry, now)}
+        cache[cache_key] = {"selected": selected, "cached_at": now}
+
+        try:
+            os.makedirs(GEMINI_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{_RANKING_CACHE_FILE}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, _RANKING_CACHE_FILE)
+        except OSError as e:
+            logger.warning(f"Failed to write Gemini ranking cache: {e}")
+
+    def _decode_object(self, text: str, start: int) -> Optional[Dict]:
+        """
+        解析串流中剛閉合的物件，失敗時改用 _extract_json 處理整段文字
+
+        Args:
+            text: 目前累積的回應文字
+            start: 物件 { 的位置
+
+        Returns:
+            Optional[Dict]: 解析後的 JSON 物件，失敗則為 None
+        """
+        try:
+            result, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(result, dict):
+                return result
+        except json.JSONDecodeError:
+            pass
+        return self._extract_json(text)
+
     def _extract_json(self, text: str) -> Optional[Dict]:
         """
         從回應文字中提取 JSON
@@ -140,49 +388,46 @@ class GeminiAnalyzer:
         Returns:
             Optional[Dict]: 解析後的 JSON 物件，失敗則為 None
         """
-        # 嘗試找到 JSON 區塊
-        json_patterns = [
-            r'```json\s*([\s\S]*?)\s*```',  # ```json ... ```
-            r'```\s*([\s\S]*?)\s*```',       # ``` ... ```
-            r'\{[\s\S]*\}',                   # 直接的 JSON 物件
-        ]
-
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        # 優先處理 ```json 區塊，其次為一般 ``` 區塊
+        for fence in ('```json', '```'):
+            for block in _iter_fenced_blocks(text, fence):
+                cleaned = block.strip()
+                if not cleaned.startswith('{'):
+                    continue
                 try:
-                    # 清理可能的問題字元
-                    cleaned = match.strip()
-                    if not cleaned.startswith('{'):
-                        continue
-                    return json.loads(cleaned)
+                    return _json_loads(cleaned)
                 except json.JSONDecodeError:
                     continue
 
+        # 沒有可用的區塊時，從第一個 { 開始解析完整的 JSON 物件
+        start = text.find('{')
+        if start >= 0:
+            try:
+                result, _ = _JSON_DECODER.raw_decode(text, start)
+                return result
+            except json.JSONDecodeError:
+                pass
+
         return None
 
     def _validate_news_item(self, item: Dict) -> bool:
         """驗證新聞項目是否完整"""
-        required_fields = ['title_zh', 'title_en', 'summary_zh', 'source', 'url', 'category', 'priority']
-        return all(field in item for field in required_fields)
+        return _REQUIRED_FIELDS.issubset(item)
 
     def _normalize_category(self, category: str) -> str:
         """正規化類別名稱"""
-        valid_categories = ['ericsson', 'ran', 'core', 'tech', 'business', 'taiwan', 'other']
         category = category.lower().strip()
-        return category if category in valid_categories else 'other'
+        return category if category in _VALID_CATEGORIES else 'other'
 
     def _normalize_badges(self, badges: List[str]) -> List[str]:
         """正規化標籤"""
-        valid_badges = ['Ericsson', 'Taiwan', 'RAN', 'Core', 'Tech', 'Business', 'Partnership', 'M&A']
-        normalized = []
+        # 以 dict 去重並保留原始順序
+        normalized = {}
         for badge in badges:
-            # 找到最接近的有效標籤
-            for valid in valid_badges:
-                if badge.lower() == valid.lower():
-                    normalized.append(valid)
-                    break
-        return list(set(normalized))[:4]  # 最多 4 個標籤
+            valid = _BADGE_LOOKUP.get(badge.lower())
+            if valid:
+                normalized[valid] = None
+        return list(normalized)[:4]  # 最多 4 個標籤
 
     def analyze_daily(self, news_content: str) -> AnalysisResult:
         """
@@ -194,13 +439,13 @@ class GeminiAnalyzer:
         Returns:
             AnalysisResult: 分析結果
         """
-        prompt = GEMINI_PROMPT_TEMPLATE.format(news_content=news_content)
+        prompt = _PROMPT_PREFIX + news_content + _PROMPT_SUFFIX
 
         for attempt in range(GEMINI_MAX_RETRIES):
             try:
                 logger.info(f"Calling Gemini API (attempt {attempt + 1}/{GEMINI_MAX_RETRIES})")
 
-                response = self.client.models.generate_content(
+                stream = self.client.models.generate_content_stream(
                     model=self.model_name,
                     contents=prompt,
                     config=types.GenerateContentConfig(
@@ -209,11 +454,29 @@ class GeminiAnalyzer:
                     )
                 )
 
-                if not response.text:
+                # 串流接收回應，最外層大括號閉合時才嘗試解析，取得完整 JSON 即停止等待剩餘內容
+                chunks = []
+                result_json = None
+                braces = _BraceTracker()
+                for chunk in stream:
+                    text = chunk.text
+                    if not text:
+                        continue
+                    chunks.append(text)
+                    start = braces.feed(text)
+                    if start is not None:
+                        result_json = self._decode_object(''.join(chunks), start)
+                        if result_json:
+                            break
+
+                response_text = ''.join(chunks)
+                if not response_text:
                     raise ValueError("Empty response from Gemini")
 
-                # 提取 JSON
-                result_json = self._extract_json(response.text)
+                # 深度追蹤未觸發解析時（例如回應格式不規則），以完整回應再解析一次
+                if not result_json:
+                    result_json = self._extract_json(response_text)
+
                 if not result_json:
                     raise ValueError("Could not extract JSON from response")
 
@@ -224,6 +487,7 @@ class GeminiAnalyzer:
                         logger.warning(f"Skipping invalid news item: {item.get('title_en', 'Unknown')}")
                         continue
 
+                    priority = int(item.get('priority', 50))
                     news_items.append(AnalyzedNews(
                         title_zh=item.get('title_zh', ''),
                         title_en=item.get('title_en', ''),
@@ -234,11 +498,11 @@ class GeminiAnalyzer:
                         tags=item.get('tags', [])[:5],
                         badges=self._normalize_badges(item.get('badges', [])),
                         category=self._normalize_category(item.get('category', 'other')),
-                        priority=min(100, max(0, int(item.get('priority', 50)))),
+                        priority=0 if priority < 0 else 100 if priority > 100 else priority,
                     ))
 
                 # 按優先級排序
-                news_items.sort(key=lambda x: x.priority, reverse=True)
+                news_items.sort(key=_PRIORITY_KEY, reverse=True)
 
                 logger.info(f"Successfully analyzed {len(news_items)} news items")
 
@@ -247,16 +511,17 @@ class GeminiAnalyzer:
                     news_items=news_items,
                     daily_trends=result_json.get('daily_trends', ''),
                     statistics=result_json.get('statistics', {}),
-                    raw_response=response.text,
+                    raw_response=response_text,
                 )
 
             except Exception as e:
                 error_msg = f"Gemini API error (attempt {attempt + 1}): {e}"
                 logger.error(error_msg)
 
-                if attempt < GEMINI_MAX_RETRIES - 1:
-                    logger.info(f"Retrying in {GEMINI_RETRY_DELAY} seconds...")
-                    time.sleep(GEMINI_RETRY_DELAY)
+                delay = _get_retry_delay(e)
+                if delay is not None and attempt < GEMINI_MAX_RETRIES - 1:
+                    logger.info(f"Retrying in {delay} seconds...")
+                    time.sleep(delay)
                 else:
                     return AnalysisResult(
                         success=False,
@@ -280,9 +545,12 @@ def create_fallback_analysis(news_items: List[Dict]) -> AnalysisResult:
         AnalysisResult: 分析結果
     """
     analyzed_items = []
+    by_source: Dict[str, int] = {}
+    by_source_get = by_source.get
 
     for item in news_items:
         source = item.get('source', '')
+        by_source[source] = by_source_get(source, 0) + 1
 
         # 根據來源設定 badge
         badges = []
@@ -310,16 +578,13 @@ def create_fallback_analysis(news_items: List[Dict]) -> AnalysisResult:
             priority=item.get('preliminary_priority', 50),
         ))
 
-    # 計算統計
+    # 統計（來源分布已在上方迴圈中累計）
     stats = {
         "total": len(analyzed_items),
         "by_category": {"news": len(analyzed_items)},
-        "by_source": {},
+        "by_source": by_source,
     }
 
-    for item in analyzed_items:
-        stats["by_source"][item.source] = stats["by_source"].get(item.source, 0) + 1
-
     return AnalysisResult(
         success=True,
         news_items=analyzed_items,
@@ -330,7 +595,6 @@ def create_fallback_analysis(news_items: List[Dict]) -> AnalysisResult:
 
 if __name__ == "__main__":
     # 測試用
-    import os
     from dotenv import load_dotenv
 
     load_dotenv()
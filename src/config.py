@@ -4,10 +4,11 @@
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class RSSSource:
     """RSS 來源設定"""
 
@@ -268,6 +269,76 @@ CATEGORY_MAPPING = {
     "major_events": "business",
 }
 
+# 各優先級的分數
+PRIORITY_TIER_SCORES = {
+    "highest": 90,
+    "high": 70,
+}
+
+
+def _build_keyword_index() -> Dict[str, Tuple[int, int, str]]:
+    """
+    建立優先級關鍵字反向索引：小寫關鍵字 → (分數, 順位, 類別)
+
+    順位為子類別定義順序的負值，讓 max() 在同分時選擇較早定義的子類別
+    """
+    index: Dict[str, Tuple[int, int, str]] = {}
+    order = 0
+    for tier, groups in PRIORITY_KEYWORDS.items():
+        score = PRIORITY_TIER_SCORES[tier]
+        for subcategory, keywords in groups.items():
+            hit = (score, -order, CATEGORY_MAPPING.get(subcategory, "other"))
+            for keyword in keywords:
+                keyword = keyword.lower()
+                index[keyword] = max(index.get(keyword, hit), hit)
+            order += 1
+    return index
+
+
+_KEYWORD_INDEX = _build_keyword_index()
+
+# (關鍵字, 命中結果) 依命中結果由高到低排序，第一個出現在文字中的即為最佳結果
+_KEYWORD_HITS = sorted(_KEYWORD_INDEX.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def classify_text(text: str) -> Tuple[int, str]:
+    """
+    依優先級關鍵字分類文字（子字串比對，與逐一 keyword in text 結果相同）
+
+    關鍵字已預先轉小寫並依優先級排序，找到第一個命中即可停止。
+
+    Args:
+        text: 已轉為小寫的文字
+
+    Returns:
+        Tuple[int, str]: (最高優先級分數, 對應類別)，無命中則為 (0, "other")
+    """
+    for keyword, hit in _KEYWORD_HITS:
+        if keyword in text:
+            return hit[0], hit[2]
+    return 0, "other"
+
+
+# 電信相關關鍵字（預先轉小寫）
+_TELECOM_KEYWORDS = tuple(keyword.lower() for keyword in TELECOM_REQUIRED_KEYWORDS)
+
+
+def is_telecom_text(text: str) -> bool:
+    """
+    檢查文字是否包含電信相關關鍵字
+
+    Args:
+        text: 已轉為小寫的文字
+
+    Returns:
+        bool: 是否與電信相關
+    """
+    for keyword in _TELECOM_KEYWORDS:
+        if keyword in text:
+            return True
+    return False
+
+
 # Badge 樣式對應
 BADGE_STYLES = {
     "ericsson": ("badge-ericsson", "⭐ Ericsson"),
@@ -285,6 +356,8 @@ BADGE_STYLES = {
 GEMINI_MODEL = "gemini-2.0-flash"
 GEMINI_MAX_RETRIES = 1
 GEMINI_RETRY_DELAY = 5  # 秒
+GEMINI_CACHE_DIR = ".gemini_cache"  # Gemini 回應快取目錄
+GEMINI_RANKING_CACHE_TTL = 3600  # 標題排序結果快取有效秒數
 
 # Email 設定
 EMAIL_SUBJECT_DAILY = "📡 電信產業日報 - {date}"
@@ -292,8 +365,18 @@ EMAIL_SUBJECT_DAILY = "📡 電信產業日報 - {date}"
 # 新聞處理設定
 MAX_NEWS_DAILY = 20
 NEWS_LOOKBACK_HOURS = 24
+RSS_FETCH_MAX_WORKERS = 16  # 同時抓取的 RSS 來源數上限
+RSS_PARSE_PROCESS_MIN_FEEDS = 4  # 待解析來源超過此數量時才以多行程解析
+RSS_FETCH_RETRIES = 2  # 連線失敗或 429/5xx 時的重試次數
+RSS_FETCH_BACKOFF = 0.3  # 重試間隔的指數退避基數（秒）
+RSS_FETCH_TIMEOUT = (5, 10)  # 連線 / 讀取逾時（秒），暫時性錯誤交由重試處理
+RSS_CIRCUIT_FAILURE_THRESHOLD = 3  # 連續失敗幾次後暫停抓取該來源
+RSS_CIRCUIT_COOLDOWN_HOURS = 48  # 暫停抓取的時數，之後再試一次
+RSS_CACHE_DIR = ".rss_cache"  # RSS 快取目錄（ETag / Last-Modified 等）
+RSS_SEEN_HISTORY_DAYS = 7  # 已寄出過的新聞在幾天內不再重複收錄
 
 # User-Agent 設定（for DigiTimes）
+# Accept-Encoding 交給 requests 預設值：gzip / deflate，安裝 brotli 時自動加上 br
 HTTP_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -311,7 +394,7 @@ def get_env(key: str, default: str = None, required: bool = False) -> str:
     return value
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     """應用程式設定"""
 
@@ -335,8 +418,15 @@ class AppConfig:
     )
 
 
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """取得應用程式設定（環境變數只解析一次）"""
+    return AppConfig()
+
+
 # Gemini 輕量化排序 prompt（只根據標題排序）
-GEMINI_RANKING_PROMPT = """你是電信產業分析師。根據以下新聞標題，選出最重要的 15 則新聞並排序。
+# 固定的規則與輸出格式在前、每次不同的標題列表在最後，讓 API 端能重用相同的提示詞前綴
+GEMINI_RANKING_PROMPT = """你是電信產業分析師。根據最後的新聞標題列表，選出最重要的 15 則新聞並排序。
 
 【優先級規則】
 1. Ericsson 相關 → 最高優先級
@@ -344,9 +434,6 @@ GEMINI_RANKING_PROMPT = """你是電信產業分析師。根據以下新聞標
 3. 5G, Open RAN, Core Network 等技術新聞 → 中高優先級
 4. 其他產業新聞 → 一般優先級
 
-【新聞標題列表】
-{titles}
-
 【輸出格式】
 只回傳 JSON，包含選中的新聞索引（從 0 開始），按重要性排序：
 {{"selected": [3, 0, 7, 12, ...]}}
@@ -355,9 +442,13 @@ GEMINI_RANKING_PROMPT = """你是電信產業分析師。根據以下新聞標
 - 最多選 15 則
 - 若總數不足 15 則，全部選取
 - 只回傳 JSON，不要其他文字
+
+【新聞標題列表】
+{titles}
 """
 
-# Gemini 分析提示詞
+# Gemini 分析提示詞（不經 str.format，新聞內容以佔位字串替換）
+GEMINI_PROMPT_PLACEHOLDER = "__NEWS_CONTENT__"
 GEMINI_PROMPT_TEMPLATE = """你是專業的電信產業分析師。分析以下新聞並產生 JSON 格式摘要。
 
 【優先級規則】
@@ -389,9 +480,9 @@ GEMINI_PROMPT_TEMPLATE = """你是專業的電信產業分析師。分析以下
 - badges 只能使用以下值：Ericsson, Taiwan, RAN, Core, Tech, Business, Partnership, M&A
 
 【輸出格式 JSON】
-{{
+{
   "news_items": [
-    {{
+    {
       "title_zh": "中文標題",
       "title_en": "原文標題（保留原文）",
       "summary_zh": "中文摘要（100-150字，保留專有名詞英文）",
@@ -402,16 +493,16 @@ GEMINI_PROMPT_TEMPLATE = """你是專業的電信產業分析師。分析以下
       "badges": ["Ericsson", "RAN"],
       "category": "ericsson|ran|core|tech|business|taiwan|other",
       "priority": 0-100
-    }}
+    }
   ],
   "daily_trends": "今日產業趨勢觀察（中文，50-100字）",
-  "statistics": {{
+  "statistics": {
     "total": 18,
-    "by_category": {{"ericsson": 2, "ran": 5, "core": 3, "tech": 4, "business": 3, "taiwan": 1, "other": 0}},
-    "by_source": {{"Light Reading": 6, "RCR Wireless News": 5, "Mobile World Live": 4, "DigiTimes": 3}}
-  }}
-}}
+    "by_category": {"ericsson": 2, "ran": 5, "core": 3, "tech": 4, "business": 3, "taiwan": 1, "other": 0},
+    "by_source": {"Light Reading": 6, "RCR Wireless News": 5, "Mobile World Live": 4, "DigiTimes": 3}
+  }
+}
 
 【新聞內容】
-{news_content}
+__NEWS_CONTENT__
 """
@@ -3,15 +3,37 @@
 """
 import logging
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from contextlib import contextmanager
+from email.message import EmailMessage
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Dict, Iterator, Optional, List
 
 logger = logging.getLogger(__name__)
 
+# SMTP 單行長度上限（不含 CRLF）
+SMTP_MAX_LINE_LENGTH = 998
 
-@dataclass
+
+def _body_cte(text: str) -> Optional[str]:
+    """
+    決定內文的 Content-Transfer-Encoding
+
+    每行都在 SMTP 長度上限內時直接以 8bit 傳送（不做 base64 編碼）；
+    否則交由 email 套件自動選擇 quoted-printable / base64。
+
+    Args:
+        text: 內文
+
+    Returns:
+        Optional[str]: '8bit' 或 None（自動選擇）
+    """
+    lines = text.encode('utf-8').splitlines()
+    if max(map(len, lines), default=0) <= SMTP_MAX_LINE_LENGTH:
+        return '8bit'
+    return None
+
+
+@dataclass(slots=True)
 class EmailConfig:
     """Email 設定"""
     smtp_server: str = "smtp.gmail.com"
@@ -21,7 +43,7 @@ class EmailConfig:
     use_tls: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailResult:
     """Email 發送結果"""
     success: bool
@@ -44,8 +66,128 @@ class EmailSender:
             config: Email 設定
         """
         self.config = config
+        self._session: Optional[smtplib.SMTP] = None
         logger.info(f"Initialized EmailSender with SMTP: {config.smtp_server}:{config.smtp_port}")
 
+    def _build_message(
+        self,
+        to: str,
+        subject: str,
+        html_content: str,
+        cc: Optional[List[str]] = None,
+        plain_text: Optional[str] = None,
+    ) -> EmailMessage:
+        """
+        建立 MIME 郵件
+
+        Args:
+            to: 收件人 email
+            subject: 郵件主旨
+            html_content: HTML 內容
+            cc: 副本收件人列表
+            plain_text: 純文字內容（備用）
+
+        Returns:
+            EmailMessage: 郵件物件
+        """
+        msg = EmailMessage()
+        msg['From'] = self.config.sender_email
+        msg['To'] = to
+        msg['Subject'] = subject
+
+        if cc:
+            msg['Cc'] = ', '.join(cc)
+
+        if plain_text:
+            # 同時有純文字（備用）與 HTML 版本
+            msg.set_content(plain_text, cte=_body_cte(plain_text))
+            msg.add_alternative(html_content, subtype='html', cte=_body_cte(html_content))
+        else:
+            # 只有 HTML 時不需要 multipart 外層
+            msg.set_content(html_content, subtype='html', cte=_body_cte(html_content))
+
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        """
+        連接 SMTP 伺服器並登入
+
+        Returns:
+            smtplib.SMTP: 已登入的 SMTP 連線
+        """
+        logger.info(f"Connecting to SMTP server: {self.config.smtp_server}")
+
+        server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
+        try:
+            if self.config.use_tls:
+                server.starttls()
+
+            logger.info("Logging in to SMTP server...")
+            server.login(self.config.sender_email, self.config.sender_password)
+        except Exception:
+            server.close()
+            raise
+
+        return server
+
+    @contextmanager
+    def session(self) -> Iterator["EmailSender"]:
+        """
+        在區塊內共用同一個 SMTP 連線（只連線、登入一次）
+
+        用法：
+            with sender.session():
+                sender.send(...)
+                sender.send(...)
+
+        Yields:
+            EmailSender: 發送器本身
+        """
+        # 已在連線中（巢狀使用）時直接沿用
+        if self._session is not None:
+            yield self
+            return
+
+        with self._connect() as server:
+            self._session = server
+            try:
+                yield self
+            finally:
+                self._session = None
+
+    def _sendmail(self, recipients: List[str], msg: EmailMessage) -> Dict:
+        """
+        發送郵件；在 session() 區塊內時沿用既有連線
+
+        Args:
+            recipients: envelope 收件人列表
+            msg: 郵件物件
+
+        Returns:
+            Dict: 伺服器拒收的收件人
+        """
+        if self._session is not None:
+            return self._deliver(self._session, recipients, msg)
+
+        with self._connect() as server:
+            return self._deliver(server, recipients, msg)
+
+    def _deliver(self, server: smtplib.SMTP, recipients: List[str], msg: EmailMessage) -> Dict:
+        """
+        透過已登入的連線送出郵件
+
+        Args:
+            server: SMTP 連線
+            recipients: envelope 收件人列表
+            msg: 郵件物件
+
+        Returns:
+            Dict: 伺服器拒收的收件人
+        """
+        # 伺服器支援 8BITMIME 時宣告 8bit 內文
+        mail_options = ['BODY=8BITMIME'] if server.has_extn('8bitmime') else []
+        return server.send_message(msg, self.config.sender_email, recipients, mail_options)
+
     def send(
         self,
         to: str,
@@ -68,41 +210,15 @@ class EmailSender:
             EmailResult: 發送結果
         """
         try:
-            # 建立郵件
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.config.sender_email
-            msg['To'] = to
-            msg['Subject'] = subject
-
-            if cc:
-                msg['Cc'] = ', '.join(cc)
-
-            # 加入純文字版本（作為備用）
-            if plain_text:
-                part1 = MIMEText(plain_text, 'plain', 'utf-8')
-                msg.attach(part1)
-
-            # 加入 HTML 版本
-            part2 = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(part2)
+            msg = self._build_message(to, subject, html_content, cc, plain_text)
 
             # 收件人列表
             recipients = [to]
             if cc:
                 recipients.extend(cc)
 
-            # 連接 SMTP 伺服器並發送
-            logger.info(f"Connecting to SMTP server: {self.config.smtp_server}")
-
-            with smtplib.SMTP(self.config.smtp_server, self.config.smtp_port) as server:
-                if self.config.use_tls:
-                    server.starttls()
-
-                logger.info("Logging in to SMTP server...")
-                server.login(self.config.sender_email, self.config.sender_password)
-
-                logger.info(f"Sending email to: {recipients}")
-                server.sendmail(self.config.sender_email, recipients, msg.as_string())
+            logger.info(f"Sending email to: {recipients}")
+            self._sendmail(recipients, msg)
 
             logger.info(f"Email sent successfully to {len(recipients)} recipient(s)")
 
@@ -135,7 +251,7 @@ class EmailSender:
         plain_text: Optional[str] = None,
     ) -> List[EmailResult]:
         """
-        發送郵件給多個收件人（個別發送）
+        發送郵件給多個收件人（個別發送，共用同一個 SMTP 連線）
 
         Args:
             to_list: 收件人 email 列表
@@ -148,15 +264,85 @@ class EmailSender:
         """
         results = []
 
-        for to in to_list:
-            result = self.send(to, subject, html_content, plain_text=plain_text)
-            results.append(result)
+        try:
+            with self.session():
+                for to in to_list:
+                    results.append(self.send(to, subject, html_content, plain_text=plain_text))
+        except Exception as e:
+            # 連線或登入失敗時，其餘收件人皆視為失敗
+            error_msg = f"SMTP error: {e}"
+            logger.error(error_msg)
+            results.extend(
+                EmailResult(success=False, message=error_msg)
+                for _ in to_list[len(results):]
+            )
 
         success_count = sum(1 for r in results if r.success)
         logger.info(f"Sent {success_count}/{len(to_list)} emails successfully")
 
         return results
 
+    def send_bulk(
+        self,
+        to_list: List[str],
+        subject: str,
+        html_content: str,
+        plain_text: Optional[str] = None,
+    ) -> EmailResult:
+        """
+        以單一 SMTP 交易發送相同郵件給多個收件人（密件副本）
+
+        收件人只出現在 SMTP envelope（RCPT TO），不會寫入郵件標頭，
+        彼此看不到其他收件人。
+
+        Args:
+            to_list: 收件人 email 列表
+            subject: 郵件主旨
+            html_content: HTML 內容
+            plain_text: 純文字內容（備用）
+
+        Returns:
+            EmailResult: 發送結果
+        """
+        if not to_list:
+            return EmailResult(success=False, message="No recipients")
+
+        try:
+            # To 標頭填寄件人本身，實際收件人只放在 envelope
+            msg = self._build_message(self.config.sender_email, subject, html_content, plain_text=plain_text)
+
+            logger.info(f"Sending bulk email to {len(to_list)} recipient(s)")
+            refused = self._sendmail(to_list, msg)
+
+            recipients = [to for to in to_list if to not in refused]
+            message = "Email sent successfully"
+            if refused:
+                message = f"Email sent, refused by server: {', '.join(refused)}"
+                logger.warning(message)
+
+            logger.info(f"Bulk email sent successfully to {len(recipients)} recipient(s)")
+
+            return EmailResult(
+                success=True,
+                message=message,
+                recipients=recipients,
+            )
+
+        except smtplib.SMTPAuthenticationError as e:
+            error_msg = f"SMTP authentication failed: {e}"
+            logger.error(error_msg)
+            return EmailResult(success=False, message=error_msg)
+
+        except smtplib.SMTPException as e:
+            error_msg = f"SMTP error: {e}"
+            logger.error(error_msg)
+            return EmailResult(success=False, message=error_msg)
+
+        except Exception as e:
+            error_msg = f"Failed to send email: {e}"
+            logger.error(error_msg)
+            return EmailResult(success=False, message=error_msg)
+
 
 def create_email_sender(gmail_user: str, gmail_app_password: str) -> EmailSender:
     """
@@ -1,25 +1,17 @@
 """
 電信產業自動摘要系統 - HTML 模板生成模組
 """
+import io
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Optional, TextIO, Tuple
 from dataclasses import dataclass
 
 from analyzer import AnalyzedNews, AnalysisResult
 
 
-# Badge CSS 類別對應
-BADGE_CLASS_MAP = {
-    "Ericsson": ("badge-ericsson", "⭐ Ericsson"),
-    "Taiwan": ("badge-taiwan", "🇹🇼 台灣"),
-    "RAN": ("badge-ran", "📡 RAN"),
-    "Core": ("badge-core", "🔧 Core"),
-    "Tech": ("badge-tech", "🚀 新技術"),
-    "Business": ("badge-business", "💼 商業"),
-    "Partnership": ("badge-partner", "🤝 合作"),
-    "M&A": ("badge-ma", "🔄 M&A"),
-}
-
 # 類別圖示
 CATEGORY_ICONS = {
     "ericsson": "🎯",
@@ -42,84 +34,156 @@ CATEGORY_BORDER_COLORS = {
     "other": "#667eea",
 }
 
+# HTML 跳脫對照表（str.translate 在 C 層一次掃描完成）
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
+
 
-def generate_badge_html(badges: List[str]) -> str:
-    """生成 badge HTML"""
-    html_parts = []
-    for badge in badges:
-        if badge in BADGE_CLASS_MAP:
-            css_class, label = BADGE_CLASS_MAP[badge]
-            html_parts.append(f'<span class="badge {css_class}">{label}</span>')
-    return "\n".join(html_parts)
+def escape(text: str) -> str:
+    """跳脫 HTML 特殊字元（用於新聞標題、摘要、網址等外部內容）"""
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 
-def generate_news_card(news: AnalyzedNews, is_featured: bool = False) -> str:
+# 卡片所需的純字串欄位（順序需與 _render_news_card 參數一致），一次在 C 層取出
+_CARD_FIELDS = attrgetter('category', 'title_zh', 'summary_zh', 'key_quote', 'title_en', 'source', 'url')
+
+
+def write_news_card(news: AnalyzedNews, out: List[str]) -> None:
     """
-    生成新聞卡片 HTML
+    將新聞卡片 HTML 加入 out（由呼叫端最後一次 join）
 
     Args:
         news: 分析後的新聞
-        is_featured: 是否為焦點新聞
-
-    Returns:
-        str: 新聞卡片 HTML
+        out: HTML 片段列表
     """
-    border_color = CATEGORY_BORDER_COLORS.get(news.category, "#667eea")
-    badges_html = generate_badge_html(news.badges)
-
-    # 如果是焦點新聞，加上焦點標籤
-    if is_featured and "🔥 焦點" not in badges_html:
-        badges_html = '<span class="badge badge-hot">🔥 焦點</span>\n' + badges_html
-
-    # 關鍵引述區塊
-    quote_html = ""
-    if news.key_quote:
-        quote_html = f'''
-        <div class="quote">
-            <strong>💬 關鍵引述：</strong>
-            <em>{news.key_quote}</em>
-        </div>
-        '''
+    out.append(_render_news_card(
+        *_CARD_FIELDS(news), tuple(news.tags),
+    ))
 
-    # 標籤
-    tags_html = " · ".join(news.tags) if news.tags else ""
 
-    return f'''
+# 新聞卡片模板（整張卡片一次 str.format 完成）
+_NEWS_CARD_TEMPLATE = '''
     <div class="news-card" style="border-left-color: {border_color};">
-        <h2>{news.title_zh}</h2>
+        <h2>{title_zh}</h2>
 
         <div class="summary">
-            <strong>📝 摘要：</strong>{news.summary_zh}
+            <strong>📝 摘要：</strong>{summary_zh}
         </div>
 
         {quote_html}
 
         <div class="metadata">
-            <div><strong>🌐 原文標題：</strong>{news.title_en}</div>
-            <div><strong>📰 來源：</strong>{news.source}</div>
+            <div><strong>🌐 原文標題：</strong>{title_en}</div>
+            <div><strong>📰 來源：</strong>{source}</div>
         </div>
 
         <div class="footer">
             <div class="tags">{tags_html}</div>
-            <a href="{news.url}" class="read-more">閱讀全文 →</a>
+            <a href="{url}" class="read-more">閱讀全文 →</a>
         </div>
     </div>
     '''
 
+# 關鍵引述區塊模板
+_NEWS_CARD_QUOTE_TEMPLATE = '''
+        <div class="quote">
+            <strong>💬 關鍵引述：</strong>
+            <em>{key_quote}</em>
+        </div>
+        '''
+
+
+@lru_cache(maxsize=256)
+def _render_news_card(
+    category: str,
+    title_zh: str,
+    summary_zh: str,
+    key_quote: str,
+    title_en: str,
+    source: str,
+    url: str,
+    tags: Tuple[str, ...],
+) -> str:
+    """
+    實際渲染新聞卡片（以卡片內容為快取鍵，重複渲染同一則新聞時直接取用）
+    """
+    # 關鍵引述區塊
+    quote_html = _NEWS_CARD_QUOTE_TEMPLATE.format(key_quote=escape(key_quote)) if key_quote else ""
+
+    return _NEWS_CARD_TEMPLATE.format(
+        border_color=CATEGORY_BORDER_COLORS.get(category, "#667eea"),
+        title_zh=escape(title_zh),
+        summary_zh=escape(summary_zh),
+        quote_html=quote_html,
+        title_en=escape(title_en),
+        source=escape(source),
+        tags_html=escape(" · ".join(tags)) if tags else "",
+        url=escape(url),
+    )
+
+
+def _extend_joined(out: List[str], items: List[str], sep: str = "\n") -> None:
+    """
+    效果等同 out.append(sep.join(items))，但片段直接加入 out，
+    由最外層一次 join，不另外產生中間字串
+    """
+    append = out.append
+    for i, item in enumerate(items):
+        if i:
+            append(sep)
+        append(item)
+
+
+def write_news_cards(news_items: List[AnalyzedNews], out: List[str]) -> None:
+    """
+    將多張新聞卡片加入 out（卡片之間以換行分隔）
+
+    Args:
+        news_items: 新聞列表
+        out: HTML 片段列表
+    """
+    render = _render_news_card
+    card_fields = _CARD_FIELDS
+    _extend_joined(out, [
+        render(*card_fields(news), tuple(news.tags))
+        for news in news_items
+    ])
+
+
+def generate_news_card(news: AnalyzedNews) -> str:
+    """
+    生成新聞卡片 HTML
+
+    Args:
+        news: 分析後的新聞
+
+    Returns:
+        str: 新聞卡片 HTML
+    """
+    parts: List[str] = []
+    write_news_card(news, parts)
+    return "".join(parts)
+
 
-def generate_section(title: str, icon: str, news_items: List[AnalyzedNews], is_featured: bool = False) -> str:
+def generate_section(title: str, icon: str, news_items: List[AnalyzedNews]) -> str:
     """生成新聞區塊"""
     if not news_items:
         return ""
 
-    cards_html = "\n".join([generate_news_card(n, is_featured) for n in news_items])
-
-    return f'''
+    parts = [f'''
     <div class="section">
         <div class="section-title">{icon} {title}</div>
-        {cards_html}
+        ''']
+    write_news_cards(news_items, parts)
+    parts.append('''
     </div>
-    '''
+    ''')
+    return "".join(parts)
 
 
 def generate_other_news_list(news_items: List[AnalyzedNews]) -> str:
@@ -127,20 +191,53 @@ def generate_other_news_list(news_items: List[AnalyzedNews]) -> str:
     if not news_items:
         return ""
 
-    items_html = "\n".join([
-        f'<li><a href="{n.url}">{n.title_zh}</a> ({n.source})</li>'
-        for n in news_items
-    ])
-
-    return f'''
+    parts = ['''
     <div class="section">
         <div class="section-title">📌 其他值得關注</div>
         <ul class="other-news">
-            {items_html}
+            ''']
+    _extend_joined(parts, [
+        f'<li><a href="{escape(n.url)}">{escape(n.title_zh)}</a> ({escape(n.source)})</li>'
+        for n in news_items
+    ])
+    parts.append('''
         </ul>
     </div>
+    ''')
+    return "".join(parts)
+
+
+# 來源分布的行內樣式（各列共用同一份字串）
+_SOURCE_BOX_STYLE = "margin-top: 20px; padding-top: 15px; border-top: 1px solid #e0e7ff;"
+_SOURCE_LIST_STYLE = "margin-top: 10px;"
+_SOURCE_ROW_STYLE = "display: flex; justify-content: space-between; margin: 5px 0;"
+_SOURCE_COUNT_STYLE = "font-weight: bold;"
+
+# 來源分布列模板
+_SOURCE_ROW_TEMPLATE = (
+    f'<div style="{_SOURCE_ROW_STYLE}">'
+    f'<span>{{source}}</span><span style="{_SOURCE_COUNT_STYLE}">{{count}}</span></div>'
+)
+
+# 來源分布區塊的固定開頭與統計區塊結尾
+_STATS_SOURCES_OPEN = f'''
+            <div style="{_SOURCE_BOX_STYLE}">
+                <strong>📰 來源分布</strong>
+                <div style="{_SOURCE_LIST_STYLE}">
+                    '''
+_STATS_SECTION_CLOSE = '''
+                </div>
+            </div>
+        </div>
+    </div>
     '''
 
+# 依數量排序用的 key
+_COUNT_KEY = itemgetter(1)
+
+# 統計區塊用到的類別（順序需與 generate_stats_section 的解包一致）
+_STAT_KEYS = ('ericsson', 'ran', 'core', 'business')
+
 
 def generate_stats_section(statistics: Dict) -> str:
     """生成統計區塊"""
@@ -148,18 +245,10 @@ def generate_stats_section(statistics: Dict) -> str:
     by_category = statistics.get('by_category', {})
     by_source = statistics.get('by_source', {})
 
-    ericsson_count = by_category.get('ericsson', 0)
-    ran_count = by_category.get('ran', 0) + by_category.get('core', 0)
-    business_count = by_category.get('business', 0)
-
-    # 來源分布
-    source_items = "\n".join([
-        f'<div style="display: flex; justify-content: space-between; margin: 5px 0;">'
-        f'<span>{source}</span><span style="font-weight: bold;">{count}</span></div>'
-        for source, count in sorted(by_source.items(), key=lambda x: x[1], reverse=True)
-    ])
+    ericsson_count, ran_count, core_count, business_count = map(by_category.get, _STAT_KEYS, repeat(0))
+    ran_count += core_count
 
-    return f'''
+    parts = [f'''
     <div class="section">
         <div class="stats-box">
             <div class="section-title">📊 今日統計</div>
@@ -180,95 +269,61 @@ def generate_stats_section(statistics: Dict) -> str:
                     <div class="stat-number">{business_count}</div>
                     <div class="stat-label">商業動態</div>
                 </div>
-            </div>
-            <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #e0e7ff;">
-                <strong>📰 來源分布</strong>
-                <div style="margin-top: 10px;">
-                    {source_items}
-                </div>
-            </div>
-        </div>
-    </div>
-    '''
+            </div>''', _STATS_SOURCES_OPEN]
 
+    # 來源分布
+    _extend_joined(parts, [
+        _SOURCE_ROW_TEMPLATE.format(source=escape(source), count=count)
+        for source, count in sorted(by_source.items(), key=_COUNT_KEY, reverse=True)
+    ])
 
-def generate_daily_email_html(result: AnalysisResult, date_str: str) -> str:
-    """
-    生成每日郵件 HTML
-
-    Args:
-        result: 分析結果
-        date_str: 日期字串
-
-    Returns:
-        str: 完整的 HTML 郵件內容
-    """
-    news_items = result.news_items
-
-    # 直接生成所有新聞卡片（不分類）
-    all_cards_html = "\n".join([generate_news_card(n) for n in news_items])
-
-    sections_html = f'''
-    <div class="section">
-        <div class="section-title">📰 今日新聞 ({len(news_items)} 則)</div>
-        {all_cards_html}
-    </div>
-    '''
-
-    # 統計資訊
-    stats_html = generate_stats_section(result.statistics)
+    parts.append(_STATS_SECTION_CLOSE)
+    return "".join(parts)
 
-    total_count = len(news_items)
 
-    return f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>電信產業日報 - {date_str}</title>
-    <style>
-        body {{
+# 每日郵件樣式（純文字常數，不經格式化）
+_DAILY_CSS = '''        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Microsoft JhengHei", Arial, sans-serif;
             background: #f5f5f5;
             margin: 0;
             padding: 20px;
             line-height: 1.6;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 700px;
             margin: 0 auto;
             background: white;
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0 0 10px 0;
             font-size: 24px;
-        }}
-        .header p {{
+        }
+        .header p {
             margin: 0;
             opacity: 0.9;
             font-size: 14px;
-        }}
+        }
 
-        .section {{
+        .section {
             padding: 20px;
             border-bottom: 1px solid #eee;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 18px;
             font-weight: bold;
             margin-bottom: 15px;
             color: #333;
-        }}
+        }
 
-        .news-card {{
+        .news-card {
             background: #f8fafc;
             margin: 15px 0;
             padding: 20px;
@@ -276,12 +331,12 @@ def generate_daily_email_html(result: AnalysisResult, date_str: str) -> str:
             box-shadow: 0 2px 4px rgba(0,0,0,0.08);
             border-left: 4px solid #667eea;
             border: 1px solid #e2e8f0;
-        }}
+        }
 
-        .badges {{
+        .badges {
             margin-bottom: 10px;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 12px;
@@ -289,153 +344,163 @@ def generate_daily_email_html(result: AnalysisResult, date_str: str) -> str:
             margin-right: 5px;
             margin-bottom: 5px;
             font-weight: 500;
-        }}
-        .badge-ericsson {{ background: #dc2626; color: white; }}
-        .badge-taiwan {{ background: #ef4444; color: white; }}
-        .badge-hot {{ background: #f97316; color: white; }}
-        .badge-ran {{ background: #3b82f6; color: white; }}
-        .badge-core {{ background: #2563eb; color: white; }}
-        .badge-tech {{ background: #06b6d4; color: white; }}
-        .badge-business {{ background: #10b981; color: white; }}
-        .badge-partner {{ background: #059669; color: white; }}
-        .badge-ma {{ background: #047857; color: white; }}
-
-        .news-card h2 {{
+        }
+        .badge-ericsson { background: #dc2626; color: white; }
+        .badge-taiwan { background: #ef4444; color: white; }
+        .badge-hot { background: #f97316; color: white; }
+        .badge-ran { background: #3b82f6; color: white; }
+        .badge-core { background: #2563eb; color: white; }
+        .badge-tech { background: #06b6d4; color: white; }
+        .badge-business { background: #10b981; color: white; }
+        .badge-partner { background: #059669; color: white; }
+        .badge-ma { background: #047857; color: white; }
+
+        .news-card h2 {
             margin: 10px 0;
             font-size: 18px;
             color: #1f2937;
             line-height: 1.4;
-        }}
+        }
 
-        .summary {{
+        .summary {
             margin: 15px 0;
             line-height: 1.6;
             color: #4b5563;
-        }}
+        }
 
-        .quote {{
+        .quote {
             margin: 15px 0;
             padding: 10px 15px;
             background: #f9fafb;
             border-left: 3px solid #667eea;
             font-style: italic;
             color: #6b7280;
-        }}
+        }
 
-        .metadata {{
+        .metadata {
             margin: 15px 0;
             font-size: 14px;
             color: #6b7280;
-        }}
-        .metadata div {{
+        }
+        .metadata div {
             margin: 5px 0;
-        }}
+        }
 
-        .footer {{
+        .footer {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-top: 15px;
             padding-top: 15px;
             border-top: 1px solid #e5e7eb;
-        }}
+        }
 
-        .tags {{
+        .tags {
             font-size: 12px;
             color: #9ca3af;
-        }}
+        }
 
-        .read-more {{
+        .read-more {
             color: #667eea;
             text-decoration: none;
             font-weight: 500;
-        }}
-        .read-more:hover {{
+        }
+        .read-more:hover {
             text-decoration: underline;
-        }}
+        }
 
-        .trends-box {{
+        .trends-box {
             background: #fffbeb;
             border: 1px solid #fcd34d;
             border-radius: 8px;
             padding: 15px;
             margin: 15px 0;
-        }}
+        }
 
-        .stats-box {{
+        .stats-box {
             background: #f0f9ff;
             border-radius: 8px;
             padding: 20px;
             margin: 15px 0;
-        }}
-        .stats-grid {{
+        }
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(2, 1fr);
             gap: 15px;
             margin-top: 10px;
-        }}
-        .stat-item {{
+        }
+        .stat-item {
             text-align: center;
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 24px;
             font-weight: bold;
             color: #667eea;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 12px;
             color: #6b7280;
             margin-top: 5px;
-        }}
+        }
 
-        .other-news {{
+        .other-news {
             padding: 10px 0;
             list-style: none;
             margin: 0;
             padding-left: 0;
-        }}
-        .other-news li {{
+        }
+        .other-news li {
             margin: 10px 0;
             padding: 10px;
             background: #f9fafb;
             border-radius: 6px;
             color: #4b5563;
-        }}
-        .other-news li a {{
+        }
+        .other-news li a {
             color: #667eea;
             text-decoration: none;
-        }}
-        .other-news li a:hover {{
+        }
+        .other-news li a:hover {
             text-decoration: underline;
-        }}
+        }
 
-        .email-footer {{
+        .email-footer {
             text-align: center;
             padding: 20px;
             color: #9ca3af;
             font-size: 12px;
             background: #f9fafb;
-        }}
+        }
 
         /* 響應式設計 */
-        @media only screen and (max-width: 600px) {{
-            body {{
+        @media only screen and (max-width: 600px) {
+            body {
                 padding: 10px;
-            }}
-            .header {{
+            }
+            .header {
                 padding: 20px;
-            }}
-            .section {{
+            }
+            .section {
                 padding: 15px;
-            }}
-            .news-card {{
+            }
+            .news-card {
                 padding: 15px;
-            }}
-            .stats-grid {{
+            }
+            .stats-grid {
                 grid-template-columns: repeat(2, 1fr);
                 gap: 10px;
-            }}
-        }}
+            }
+        }'''
+
+# 每日郵件外框（模組載入時建立一次，每次只填入欄位）
+_DAILY_EMAIL_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>電信產業日報 - {date_str}</title>
+    <style>
+{css}
     </style>
 </head>
 <body>
@@ -458,77 +523,123 @@ def generate_daily_email_html(result: AnalysisResult, date_str: str) -> str:
 </html>'''
 
 
-def generate_error_email_html(error_type: str, error_details: str, timestamp: str, github_url: str = "") -> str:
+# 每日郵件外框在新聞區塊前後切開，供串流寫出
+_DAILY_EMAIL_HEAD, _DAILY_EMAIL_TAIL = _DAILY_EMAIL_TEMPLATE.split("{sections_html}")
+
+# 再於 CSS 處切開：CSS 原樣寫出，只有前後兩小段需要格式化
+_DAILY_EMAIL_OPEN, _DAILY_EMAIL_HEADER = _DAILY_EMAIL_HEAD.split("{css}")
+
+
+def write_daily_email_html(result: AnalysisResult, date_str: str, out: TextIO) -> None:
     """
-    生成錯誤通知郵件
+    將每日郵件 HTML 依序寫入 out（StringIO 或已開啟的檔案）
 
     Args:
-        error_type: 錯誤類型
-        error_details: 錯誤詳細資訊
-        timestamp: 時間戳
-        github_url: GitHub Actions URL
+        result: 分析結果
+        date_str: 日期字串
+        out: 文字輸出串流
+    """
+    news_items = result.news_items
+    total_count = len(news_items)
+
+    out.write(_DAILY_EMAIL_OPEN.format(date_str=date_str))
+    out.write(_DAILY_CSS)
+    out.write(_DAILY_EMAIL_HEADER.format(
+        date_str=date_str,
+        total_count=total_count,
+    ))
+
+    # 直接生成所有新聞卡片（不分類）
+    out.write(f'''
+    <div class="section">
+        <div class="section-title">📰 今日新聞 ({total_count} 則)</div>
+        ''')
+    cards: List[str] = []
+    write_news_cards(news_items, cards)
+    out.writelines(cards)
+    out.write('''
+    </div>
+    ''')
+
+    out.write(_DAILY_EMAIL_TAIL)
+
+
+def generate_daily_email_html(result: AnalysisResult, date_str: str) -> str:
+    """
+    生成每日郵件 HTML
+
+    Args:
+        result: 分析結果
+        date_str: 日期字串
 
     Returns:
-        str: 錯誤郵件 HTML
+        str: 完整的 HTML 郵件內容
     """
-    github_link = f'<p><a href="{github_url}">查看完整 logs →</a></p>' if github_url else ""
+    out = io.StringIO()
+    write_daily_email_html(result, date_str, out)
+    return out.getvalue()
 
-    return f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>電信日報系統錯誤通知</title>
-    <style>
-        body {{
+
+# 錯誤通知郵件樣式
+_ERROR_CSS = '''        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Arial, sans-serif;
             background: #f5f5f5;
             margin: 0;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 600px;
             margin: 0 auto;
             background: white;
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #dc2626 0%, #991b1b 100%);
             color: white;
             padding: 30px;
-        }}
-        .content {{
+        }
+        .content {
             padding: 30px;
-        }}
-        .error-box {{
+        }
+        .error-box {
             background: #fef2f2;
             border: 1px solid #fecaca;
             border-radius: 8px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .error-type {{
+        }
+        .error-type {
             font-weight: bold;
             color: #dc2626;
             margin-bottom: 10px;
-        }}
-        .error-details {{
+        }
+        .error-details {
             color: #7f1d1d;
             white-space: pre-wrap;
             font-family: monospace;
             font-size: 14px;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             padding: 20px;
             color: #9ca3af;
             font-size: 12px;
             background: #f9fafb;
-        }}
-        a {{
+        }
+        a {
             color: #667eea;
-        }}
+        }'''
+
+# 錯誤通知郵件外框
+_ERROR_EMAIL_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>電信日報系統錯誤通知</title>
+    <style>
+{css}
     </style>
 </head>
 <body>
@@ -551,3 +662,77 @@ def generate_error_email_html(error_type: str, error_details: str, timestamp: st
     </div>
 </body>
 </html>'''
+
+
+# 錯誤郵件固定的開頭（含 CSS）於載入時先接好
+_ERROR_EMAIL_PREFIX, _ERROR_EMAIL_BODY = _ERROR_EMAIL_TEMPLATE.split("{css}")
+_ERROR_EMAIL_PREFIX += _ERROR_CSS
+
+
+def generate_error_email_html(error_type: str, error_details: str, timestamp: str, github_url: str = "") -> str:
+    """
+    生成錯誤通知郵件
+
+    Args:
+        error_type: 錯誤類型
+        error_details: 錯誤詳細資訊
+        timestamp: 時間戳
+        github_url: GitHub Actions URL
+
+    Returns:
+        str: 錯誤郵件 HTML
+    """
+    github_link = f'<p><a href="{github_url}">查看完整 logs →</a></p>' if github_url else ""
+
+    return _ERROR_EMAIL_PREFIX + _ERROR_EMAIL_BODY.format(
+        error_type=error_type,
+        error_details=error_details,
+        timestamp=timestamp,
+        github_link=github_link,
+    )
+
+
+if __name__ == "__main__":
+    # 測試用：以 100 則模擬新聞量測渲染時間
+    import timeit
+
+    categories = list(CATEGORY_BORDER_COLORS)
+    badge_names = ["Ericsson", "Taiwan", "RAN", "Core", "Tech", "Business", "Partnership", "M&A"]
+    news_items = [
+        AnalyzedNews(
+            title_zh=f"測試新聞標題 {i}：Ericsson 與 <台灣> 業者合作 & 佈建 5G",
+            title_en=f"Test headline {i}: Ericsson & partners deploy \"5G SA\"",
+            summary_zh="這是一段模擬的新聞摘要，用來量測郵件渲染效能。" * 3,
+            key_quote="We expect Open RAN to scale in 2025." if i % 3 == 0 else "",
+            source=f"Source {i % 6}",
+            url=f"https://example.com/news/{i}?utm_source=rss&id={i}",
+            tags=["5G", "Open RAN", "Taiwan"],
+            badges=badge_names[i % len(badge_names):][:3],
+            category=categories[i % len(categories)],
+            priority=100 - i,
+        )
+        for i in range(100)
+    ]
+    result = AnalysisResult(
+        success=True,
+        news_items=news_items,
+        statistics={
+            'total': len(news_items),
+            'by_category': {c: sum(n.category == c for n in news_items) for c in categories},
+            'by_source': {f"Source {i}": 100 // 6 for i in range(6)},
+        },
+    )
+
+    def render_cold():
+        _render_news_card.cache_clear()
+        return generate_daily_email_html(result, "2025年01月15日 (Wed)")
+
+    def render_warm():
+        return generate_daily_email_html(result, "2025年01月15日 (Wed)")
+
+    html = render_cold()
+    print(f"HTML size: {len(html):,} chars")
+    for name, func in (("cold (card cache cleared)", render_cold), ("warm (card cache hit)", render_warm)):
+        number = 200
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name}: {best * 1000:.3f} ms per render")
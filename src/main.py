@@ -2,7 +2,6 @@
 """
 電信產業自動摘要系統 - 主程式入口
 """
-import argparse
 import logging
 import os
 import sys
@@ -13,17 +12,14 @@ from dotenv import load_dotenv
 
 from config import (
     AppConfig,
+    get_config,
     MAX_NEWS_DAILY,
     NEWS_LOOKBACK_HOURS,
     EMAIL_SUBJECT_DAILY,
 )
-from rss_fetcher import RSSFetcher, format_news_for_gemini, format_titles_for_ranking
-from analyzer import GeminiAnalyzer, create_fallback_analysis
-from email_sender import create_email_sender
-from html_template import (
-    generate_daily_email_html,
-    generate_error_email_html,
-)
+
+# rss_fetcher（feedparser、requests）、analyzer（google-genai）、email_sender、html_template
+# 於實際用到的函式內才載入，各執行路徑只付出自己需要的匯入成本
 
 
 # 設定日誌
@@ -42,11 +38,13 @@ def setup_logging(debug: bool = False):
 logger = logging.getLogger(__name__)
 
 
+# 台灣時區（固定 UTC+8，無日光節約時間）
+_TW_TZ = timezone(timedelta(hours=8))
+
+
 def get_taiwan_time() -> datetime:
     """取得台灣時間"""
-    utc_now = datetime.now(timezone.utc)
-    taiwan_tz = timezone(timedelta(hours=8))
-    return utc_now.astimezone(taiwan_tz)
+    return datetime.now(_TW_TZ)
 
 
 def format_date_taiwan(dt: Optional[datetime] = None) -> str:
@@ -67,6 +65,11 @@ def run_daily_digest(config: AppConfig, test_mode: bool = False) -> bool:
     Returns:
         bool: 是否成功
     """
+    from rss_fetcher import RSSFetcher, format_titles_for_ranking
+    from analyzer import GeminiAnalyzer, create_fallback_analysis
+    from email_sender import create_email_sender
+    from html_template import generate_daily_email_html, write_daily_email_html
+
     logger.info("=" * 60)
     logger.info("Starting Daily Digest")
     logger.info("=" * 60)
@@ -120,17 +123,18 @@ def run_daily_digest(config: AppConfig, test_mode: bool = False) -> bool:
 
         # Step 4: 生成 HTML
         logger.info("Step 4: Generating HTML email...")
-        html_content = generate_daily_email_html(result, date_str)
 
-        # 測試模式：儲存 HTML 到檔案
+        # 測試模式：HTML 直接串流寫入檔案，不另外組出完整字串
         if test_mode:
             output_file = f"output/daily_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
             os.makedirs("output", exist_ok=True)
             with open(output_file, "w", encoding="utf-8") as f:
-                f.write(html_content)
+                write_daily_email_html(result, date_str, f)
             logger.info(f"Test mode: HTML saved to {output_file}")
             return True
 
+        html_content = generate_daily_email_html(result, date_str)
+
         # Step 5: 發送 Email
         logger.info("Step 5: Sending email...")
         sender = create_email_sender(config.gmail_user, config.gmail_app_password)
@@ -146,6 +150,9 @@ def run_daily_digest(config: AppConfig, test_mode: bool = False) -> bool:
             logger.error(f"Failed to send email: {email_result.message}")
             return False
 
+        # 寄出成功後才記錄已收錄的新聞，之後幾天不再重複收錄
+        fetcher.save_seen_history()
+
         logger.info("✅ Daily digest sent successfully!")
         return True
 
@@ -169,6 +176,9 @@ def send_error_notification(config: AppConfig, error_type: str, error_details: s
         error_details: 錯誤詳細資訊
     """
     try:
+        from email_sender import create_email_sender
+        from html_template import generate_error_email_html
+
         timestamp = get_taiwan_time().strftime("%Y-%m-%d %H:%M:%S (台北時間)")
         github_url = os.getenv("GITHUB_SERVER_URL", "")
         if github_url:
@@ -198,6 +208,8 @@ def send_error_notification(config: AppConfig, error_type: str, error_details: s
 
 def test_rss_only():
     """僅測試 RSS 抓取"""
+    from rss_fetcher import RSSFetcher
+
     logger.info("Testing RSS fetch only...")
 
     fetcher = RSSFetcher(lookback_hours=48)
@@ -223,6 +235,9 @@ def test_rss_only():
 
 def test_gemini_only(api_key: str):
     """僅測試 Gemini 排序（輕量化方案）"""
+    from rss_fetcher import RSSFetcher, format_titles_for_ranking
+    from analyzer import GeminiAnalyzer
+
     logger.info("Testing Gemini ranking only...")
 
     # 先抓取新聞
@@ -262,8 +277,31 @@ def test_gemini_only(api_key: str):
         print("Ranking failed, would use fallback")
 
 
+def run_daily_digest_and_exit(test_mode: bool = False):
+    """載入設定、執行每日摘要，並以結果作為結束碼"""
+    # 載入設定
+    try:
+        config = get_config()
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        sys.exit(1)
+
+    # 執行每日摘要
+    success = run_daily_digest(config, test_mode=test_mode)
+
+    sys.exit(0 if success else 1)
+
+
 def main():
     """主程式入口"""
+    # 排程執行（無參數）為最常見的路徑，直接執行每日摘要，不必匯入與建立 argparse
+    if len(sys.argv) == 1:
+        load_dotenv()
+        setup_logging()
+        run_daily_digest_and_exit()
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="電信產業自動摘要系統",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -276,17 +314,19 @@ def main():
         """
     )
 
-    parser.add_argument(
+    # 執行模式彼此互斥，各自只載入需要的模組
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
         "--test",
         action="store_true",
         help="測試模式（生成 HTML 但不發送郵件）"
     )
-    parser.add_argument(
+    mode.add_argument(
         "--test-rss",
         action="store_true",
         help="僅測試 RSS 抓取功能"
     )
-    parser.add_argument(
+    mode.add_argument(
         "--test-gemini",
         action="store_true",
         help="僅測試 Gemini 分析功能"
@@ -318,17 +358,7 @@ def main():
         test_gemini_only(api_key)
         return
 
-    # 載入設定
-    try:
-        config = AppConfig()
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        sys.exit(1)
-
-    # 執行每日摘要
-    success = run_daily_digest(config, test_mode=args.test)
-
-    sys.exit(0 if success else 1)
+    run_daily_digest_and_exit(test_mode=args.test)
 
 
 if __name__ == "__main__":
@@ -2,19 +2,101 @@
 電信產業自動摘要系統 - RSS 抓取模組
 """
 import hashlib
+import heapq
+import html
+import json
 import logging
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Tuple
+from email.utils import parsedate_to_datetime
+from functools import cached_property, lru_cache, partial
+from operator import attrgetter, itemgetter
+from typing import Callable, List, Optional, Dict, Tuple, Union
 from time import mktime
 
 import feedparser
 import requests
-
-from config import RSS_FEEDS, RSSSource, HTTP_HEADERS, PRIORITY_KEYWORDS, CATEGORY_MAPPING, TELECOM_REQUIRED_KEYWORDS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dateutil import parser as dateutil_parser
+
+from config import (
+    RSS_FEEDS,
+    RSSSource,
+    HTTP_HEADERS,
+    classify_text,
+    is_telecom_text,
+    RSS_FETCH_MAX_WORKERS,
+    RSS_PARSE_PROCESS_MIN_FEEDS,
+    RSS_FETCH_RETRIES,
+    RSS_FETCH_BACKOFF,
+    RSS_FETCH_TIMEOUT,
+    RSS_CIRCUIT_FAILURE_THRESHOLD,
+    RSS_CIRCUIT_COOLDOWN_HOURS,
+    RSS_CACHE_DIR,
+    RSS_SEEN_HISTORY_DAYS,
+)
 
 logger = logging.getLogger(__name__)
 
+# HTML 標籤與連續空白
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# (優先級, 類別, 新聞) 依優先級排序用的 key
+_PRIORITY_KEY = itemgetter(0)
+
+# 依發布時間排序用的 key（比較 float 時間戳，不必每次比較都換算時區）
+_PUBLISHED_KEY = attrgetter("published_ts")
+
+# Gemini 分析用的單則新聞格式（各則之間以空行分隔，不另加分隔線以節省 token）
+_GEMINI_NEWS_TEMPLATE = (
+    "【新聞 {index}】\n"
+    "標題: {title}\n"
+    "來源: {source}\n"
+    "語言: {source_language}\n"
+    "發布時間: {published}\n"
+    "連結: {link}\n"
+    "摘要: {description}"
+)
+
+# 時間後帶 AM/PM 的日期字串（不限於結尾，例如 "4:04 PM +0000"）
+_MERIDIEM_RE = re.compile(r'\d\s*[ap]\.?m\.?(?![a-z])', re.IGNORECASE)
+
+# dateutil 之前先嘗試的自訂日期格式
+_CUSTOM_DATE_FORMATS = (
+    "%b %d, %Y %I:%M%p",     # "Jan 23, 2026 4:04pm"
+    "%b %d, %Y %I:%M %p",    # "Jan 23, 2026 4:04 PM"
+    "%Y-%m-%d %H:%M:%S",     # ISO 格式
+    "%d %b %Y %H:%M:%S",     # "23 Jan 2026 12:00:00"
+)
+
+# 各來源上次回應的 ETag / Last-Modified 與內容 hash，供條件式 GET 與略過重複解析使用
+_VALIDATORS_FILE = os.path.join(RSS_CACHE_DIR, "etags.json")
+
+# 各來源連續失敗次數與最近成功 / 失敗時間，供斷路器判斷是否暫停抓取
+_HEALTH_FILE = os.path.join(RSS_CACHE_DIR, "health.json")
+
+# 上述兩個狀態檔各欄位允許的型別，載入時用來丟棄損毀的項目
+_VALIDATOR_FIELDS = {
+    "etag": (str, type(None)),
+    "last_modified": (str, type(None)),
+    "body_hash": (str,),
+    "fetched_at": (str,),
+}
+_HEALTH_FIELDS = {
+    "consecutive_failures": (int,),
+    "last_success_ts": (int, float),
+    "last_failure_ts": (int, float),
+}
+
+# 近幾天已收錄新聞的 url_hash（依 UTC 日期分組），跨次執行去重用
+_SEEN_FILE = os.path.join(RSS_CACHE_DIR, "seen.json")
+
 
 @dataclass
 class NewsItem:
@@ -26,11 +108,13 @@ class NewsItem:
     source: str
     source_language: str = "en"
     url_hash: str = ""
+    published_ts: float = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        """計算 URL hash 用於去重"""
+        """計算 URL hash 用於去重（僅供程序內比對，不需加密強度），並記錄排序用的時間戳"""
         if not self.url_hash:
-            self.url_hash = hashlib.md5(self.link.encode()).hexdigest()[:12]
+            self.url_hash = format(zlib.crc32(self.link.encode()), '08x')
+        self.published_ts = self.published.timestamp()
 
     def to_dict(self) -> Dict:
         """轉換為字典格式"""
@@ -44,6 +128,23 @@ class NewsItem:
             "url_hash": self.url_hash,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NewsItem":
+        """由 to_dict 的結果還原（url_hash 重新計算）"""
+        return cls(
+            title=data["title"],
+            link=data["link"],
+            description=data["description"],
+            published=datetime.fromisoformat(data["published"]),
+            source=data["source"],
+            source_language=data.get("source_language", "en"),
+        )
+
+    @cached_property
+    def search_text(self) -> str:
+        """標題與描述合併後的小寫文字，供關鍵字比對（每則新聞只轉換一次）"""
+        return f"{self.title} {self.description}".lower()
+
 
 @dataclass
 class FetchResult:
@@ -55,119 +156,329 @@ class FetchResult:
     fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-class RSSFetcher:
-    """RSS 新聞抓取器"""
+def _create_session() -> requests.Session:
+    """
+    建立共用的 HTTP Session（連線池 + 自動重試），讓同一主機的連線與 TLS 交握可重複使用
 
-    def __init__(self, lookback_hours: int = 24):
-        """
-        初始化 RSS 抓取器
+    Returns:
+        requests.Session: 已設定 headers 與重試策略的 Session
+    """
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+
+    retry = Retry(
+        total=RSS_FETCH_RETRIES,
+        backoff_factor=RSS_FETCH_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,  # 重試用盡後回傳最後的回應，交由 raise_for_status 處理
+        # 不依 429/503 的 Retry-After 等待（可能長達數分鐘），一律採用上面的短暫退避
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=RSS_FETCH_MAX_WORKERS,
+        pool_maxsize=RSS_FETCH_MAX_WORKERS,
+        max_retries=retry,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _load_json(path: str) -> Dict:
+    """讀取 JSON 快取檔，不存在或損毀時回傳空字典"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+        return {}
+
+
+def _save_json(path: str, data: Dict) -> None:
+    """寫入 JSON 快取檔（先寫暫存檔再取代，避免中斷時留下不完整的檔案）"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write cache file {path}: {e}")
+
+
+def _load_url_states(path: str, field_types: Dict[str, tuple]) -> Dict[str, Dict]:
+    """
+    讀取以來源 URL 為 key 的狀態檔，丟棄格式不符的項目（損毀或手動修改的檔案）
+
+    格式不符的項目若留著，會讓該來源每次執行都出錯，或在多執行緒中拋出例外中斷整批抓取
+
+    Args:
+        path: 狀態檔路徑
+        field_types: 欄位名稱 → 允許的型別（欄位可省略）
+
+    Returns:
+        Dict[str, Dict]: 格式正確的項目
+    """
+    states = {}
+    for url, state in _load_json(path).items():
+        if isinstance(state, dict) and all(
+            isinstance(state.get(name), types) and not isinstance(state.get(name), bool)
+            for name, types in field_types.items()
+            if name in state
+        ):
+            states[url] = state
+        else:
+            logger.warning(f"Ignoring malformed cache entry for {url} in {path}")
+    return states
+
+
+def _entries_path(source: RSSSource) -> str:
+    """來源條目快取檔路徑（以 URL 的 hash 命名）"""
+    key = hashlib.sha1(source.url.encode()).hexdigest()[:16]
+    return os.path.join(RSS_CACHE_DIR, "entries", f"{key}.json")
+
+
+def _load_cached_entries(source: RSSSource) -> Optional[List["NewsItem"]]:
+    """讀取上次解析的條目，沒有快取時回傳 None"""
+    path = _entries_path(source)
+    if not os.path.exists(path):
+        return None
+    data = _load_json(path)
+    try:
+        return [NewsItem.from_dict(item) for item in data.get("items", [])]
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring invalid cached entries for {source.name}: {e}")
+        return None
+
+
+def _save_cached_entries(source: RSSSource, news_items: List["NewsItem"]) -> None:
+    """寫入本次解析的條目，供之後 304 時重複使用"""
+    _save_json(_entries_path(source), {"items": [item.to_dict() for item in news_items]})
 
-        Args:
-            lookback_hours: 抓取過去多少小時的新聞
-        """
-        self.lookback_hours = lookback_hours
-        self.seen_hashes: set = set()
 
-    def _parse_custom_date(self, date_str: str) -> Optional[datetime]:
-        """嘗試解析自定義日期格式"""
-        from dateutil import parser as dateutil_parser
+@lru_cache(maxsize=4096)
+def _parse_custom_date(date_str: str) -> Optional[datetime]:
+    """
+    嘗試解析自定義日期格式
 
+    依成本由低到高嘗試：ISO 8601、RFC 822、常見自訂格式，最後才交給較慢的 dateutil；
+    同一 feed 內常有相同時間字串，因此快取結果
+    """
+    # ISO 8601（含結尾 Z），例如 "2026-01-23T16:04:00Z"
+    try:
+        dt = datetime.fromisoformat(date_str)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except ValueError:
+        pass
+
+    # RFC 822，例如 "Fri, 23 Jan 2026 16:04:00 +0000"
+    # （email.utils 會忽略 AM/PM，這類字串留給下方的格式或 dateutil 處理）
+    if not _MERIDIEM_RE.search(date_str):
         try:
-            # dateutil 可以解析大部分日期格式，包括 "Jan 23, 2026 4:04pm"
-            dt = dateutil_parser.parse(date_str)
+            dt = parsedate_to_datetime(date_str)
             if dt.tzinfo is None:
                 dt = dt.replace(tzinfo=timezone.utc)
             return dt
         except (ValueError, TypeError):
             pass
 
-        # 備用: 手動解析常見格式
-        custom_formats = [
-            "%b %d, %Y %I:%M%p",     # "Jan 23, 2026 4:04pm"
-            "%b %d, %Y %I:%M %p",    # "Jan 23, 2026 4:04 PM"
-            "%Y-%m-%d %H:%M:%S",     # ISO 格式
-            "%d %b %Y %H:%M:%S",     # "23 Jan 2026 12:00:00"
-        ]
-
-        for fmt in custom_formats:
+    # 手動解析常見格式
+    for fmt in _CUSTOM_DATE_FORMATS:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+
+    # 最後手段: dateutil 可以解析大部分日期格式
+    try:
+        dt = dateutil_parser.parse(date_str)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    return None
+
+
+def _parse_published_date(entry: dict) -> Optional[datetime]:
+    """解析發布日期"""
+    # 嘗試多種日期欄位
+    date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
+
+    for field_name in date_fields:
+        if hasattr(entry, field_name) and getattr(entry, field_name):
             try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.replace(tzinfo=timezone.utc)
-            except ValueError:
+                parsed = getattr(entry, field_name)
+                dt = datetime.fromtimestamp(mktime(parsed), tz=timezone.utc)
+                return dt
+            except (TypeError, ValueError, OverflowError):
                 continue
 
+    # 新增: 嘗試解析原始日期字串
+    raw_date_fields = ['published', 'updated', 'created']
+    for field_name in raw_date_fields:
+        raw_date = entry.get(field_name)
+        if raw_date:
+            parsed_dt = _parse_custom_date(raw_date)
+            if parsed_dt:
+                return parsed_dt
+
+    # 如果沒有日期，返回 None 而不是假設是今天
+    return None
+
+
+def _clean_html(text: str) -> str:
+    """清理 HTML 標籤"""
+    # 移除 HTML 標籤
+    clean = _TAG_RE.sub('', text)
+    # 處理 HTML 實體（具名與數字實體一次處理）
+    clean = html.unescape(clean)
+    # 清理多餘空白（含 &nbsp; 轉出的 \xa0）
+    clean = _WS_RE.sub(' ', clean).strip()
+    return clean
+
+
+def _entry_to_news_item(entry: dict, source: RSSSource) -> Optional[NewsItem]:
+    """
+    將單一 feed 條目轉換為新聞項目
+
+    Args:
+        entry: feedparser 條目
+        source: RSS 來源設定
+
+    Returns:
+        Optional[NewsItem]: 新聞項目，缺少日期、標題或連結時為 None
+    """
+    # 解析發布日期
+    published = _parse_published_date(entry)
+
+    # 如果無法解析日期，跳過這條新聞（比假設是今天更安全）
+    if published is None:
+        logger.warning(f"Skipping entry with unparsable date: {entry.get('title', 'unknown')[:50]}")
+        return None
+
+    link = entry.get('link', '')
+    if not link:
         return None
 
-    def _parse_published_date(self, entry: dict) -> Optional[datetime]:
-        """解析發布日期"""
-        # 嘗試多種日期欄位
-        date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
-
-        for field_name in date_fields:
-            if hasattr(entry, field_name) and getattr(entry, field_name):
-                try:
-                    parsed = getattr(entry, field_name)
-                    dt = datetime.fromtimestamp(mktime(parsed), tz=timezone.utc)
-                    return dt
-                except (TypeError, ValueError, OverflowError):
-                    continue
-
-        # 新增: 嘗試解析原始日期字串
-        raw_date_fields = ['published', 'updated', 'created']
-        for field_name in raw_date_fields:
-            raw_date = entry.get(field_name)
-            if raw_date:
-                parsed_dt = self._parse_custom_date(raw_date)
-                if parsed_dt:
-                    return parsed_dt
-
-        # 如果沒有日期，返回 None 而不是假設是今天
+    # 取得標題和描述
+    title = _clean_html(entry.get('title', ''))
+    if not title:
         return None
 
-    def _clean_html(self, text: str) -> str:
-        """清理 HTML 標籤"""
-        import re
-        # 移除 HTML 標籤
-        clean = re.sub(r'<[^>]+>', '', text)
-        # 處理 HTML 實體
-        clean = clean.replace('&nbsp;', ' ')
-        clean = clean.replace('&amp;', '&')
-        clean = clean.replace('&lt;', '<')
-        clean = clean.replace('&gt;', '>')
-        clean = clean.replace('&quot;', '"')
-        clean = clean.replace('&#39;', "'")
-        # 清理多餘空白
-        clean = re.sub(r'\s+', ' ', clean).strip()
-        return clean
-
-    def _calculate_preliminary_priority(self, title: str, description: str) -> Tuple[int, str]:
+    description = _clean_html(entry.get('description') or entry.get('summary') or '')
+
+    return NewsItem(
+        title=title,
+        link=link,
+        description=description[:500],  # 限制描述長度
+        published=published,
+        source=source.name,
+        source_language=source.language,
+    )
+
+
+def _parse_feed(body: bytes, source: RSSSource, content_type: Optional[str] = None) -> List[NewsItem]:
+    """
+    解析 feed 內容為新聞項目（不過濾時間範圍，供快取重複使用）
+
+    為模組層級函式，可直接交給 ProcessPoolExecutor 在子行程中執行。
+    各執行模式的時間範圍不同（每日 24 小時、測試 48 小時）且共用快取，
+    因此時間過濾一律在讀取結果後由 _filter_recent 進行。
+
+    Args:
+        body: feed 原始內容
+        source: RSS 來源設定
+        content_type: 回應的 Content-Type，讓 feedparser 直接採用宣告的編碼
+
+    Returns:
+        List[NewsItem]: 新聞項目列表
+    """
+    # 使用 feedparser 解析（下載由 requests 負責，這裡只交給它已取得的內容與 headers）
+    response_headers = {"content-type": content_type} if content_type else None
+    # 內文 HTML 之後會被 _clean_html 移除標籤，不需要解析其中的相對網址
+    feed = feedparser.parse(body, response_headers=response_headers, resolve_relative_uris=False)
+
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"Feed parsing error: {feed.bozo_exception}")
+
+    return [
+        news_item
+        for entry in feed.entries
+        if (news_item := _entry_to_news_item(entry, source)) is not None
+    ]
+
+
+@dataclass
+class _PendingParse:
+    """已下載、尚待解析的 feed 內容"""
+    source: RSSSource
+    body: bytes
+    body_hash: str
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class RSSFetcher:
+    """RSS 新聞抓取器"""
+
+    def __init__(self, lookback_hours: int = 24):
+        """
+        初始化 RSS 抓取器
+
+        Args:
+            lookback_hours: 抓取過去多少小時的新聞
+        """
+        self.lookback_hours = lookback_hours
+        self.today = datetime.now(timezone.utc).date().isoformat()
+        self.seen_history: Dict[str, List[str]] = self._load_seen_history()
+        # 先放入前幾天已收錄的新聞；當天的紀錄不計入，同一天重跑時能得到相同結果
+        self.seen_hashes: set = set().union(*(
+            hashes for day, hashes in self.seen_history.items() if day != self.today
+        ))
+        self.new_hashes: List[str] = []
+        self.session = _create_session()
+        self.validators: Dict[str, Dict] = _load_url_states(_VALIDATORS_FILE, _VALIDATOR_FIELDS)
+        self.health: Dict[str, Dict] = _load_url_states(_HEALTH_FILE, _HEALTH_FIELDS)
+
+    def _load_seen_history(self) -> Dict[str, List[str]]:
+        """讀取已收錄新聞紀錄，並丟棄超過 RSS_SEEN_HISTORY_DAYS 天的日期"""
+        oldest = (datetime.now(timezone.utc) - timedelta(days=RSS_SEEN_HISTORY_DAYS)).date().isoformat()
+        return {
+            day: hashes
+            for day, hashes in _load_json(_SEEN_FILE).items()
+            if day > oldest and isinstance(hashes, list)
+        }
+
+    def save_seen_history(self) -> None:
+        """
+        記錄本次收錄的新聞，之後幾天的執行會略過它們
+
+        應在摘要成功寄出後才呼叫，失敗的執行不會讓新聞被略過
+        """
+        self.seen_history[self.today] = self.new_hashes
+        _save_json(_SEEN_FILE, self.seen_history)
+        logger.info(f"Recorded {len(self.new_hashes)} seen news items for {self.today}")
+
+    def _calculate_preliminary_priority(self, text: str) -> Tuple[int, str]:
         """
         計算初步優先級分數（用於預過濾）
 
+        Args:
+            text: 已轉為小寫的標題與描述（NewsItem.search_text）
+
         Returns:
             Tuple[int, str]: (優先級分數, 主要類別)
         """
-        text = f"{title} {description}".lower()
-        max_priority = 0
-        main_category = "other"
-
-        # 檢查最高優先級關鍵字
-        for category, keywords in PRIORITY_KEYWORDS.get("highest", {}).items():
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    priority = 90
-                    if priority > max_priority:
-                        max_priority = priority
-                        main_category = CATEGORY_MAPPING.get(category, "other")
-
-        # 檢查高優先級關鍵字
-        for category, keywords in PRIORITY_KEYWORDS.get("high", {}).items():
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    priority = 70
-                    if priority > max_priority:
-                        max_priority = priority
-                        main_category = CATEGORY_MAPPING.get(category, "other")
+        max_priority, main_category = classify_text(text)
 
         # 如果沒有匹配任何關鍵字，給予基礎分數
         if max_priority == 0:
@@ -175,125 +486,225 @@ class RSSFetcher:
 
         return max_priority, main_category
 
-    def _is_telecom_related(self, title: str, description: str) -> bool:
+    def _is_telecom_related(self, text: str) -> bool:
         """
         檢查新聞是否與電信相關
 
         Args:
-            title: 新聞標題
-            description: 新聞描述
+            text: 已轉為小寫的標題與描述（NewsItem.search_text）
 
         Returns:
             bool: 是否與電信相關
         """
-        text = f"{title} {description}".lower()
-
-        for keyword in TELECOM_REQUIRED_KEYWORDS:
-            if keyword.lower() in text:
-                return True
-
-        return False
+        return is_telecom_text(text)
+
+    def _cutoff_time(self) -> datetime:
+        """時間範圍的起點"""
+        return datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
+
+    def _filter_recent(self, news_items: List[NewsItem], cutoff_time: datetime) -> List[NewsItem]:
+        """只保留時間範圍內的新聞"""
+        return [item for item in news_items if item.published >= cutoff_time]
+
+    def _circuit_open(self, source: RSSSource) -> bool:
+        """來源連續失敗達門檻且仍在冷卻時間內時，暫不抓取"""
+        state = self.health.get(source.url)
+        if not state or state.get("consecutive_failures", 0) < RSS_CIRCUIT_FAILURE_THRESHOLD:
+            return False
+        elapsed = datetime.now(timezone.utc).timestamp() - state.get("last_failure_ts", 0)
+        return elapsed < RSS_CIRCUIT_COOLDOWN_HOURS * 3600
+
+    def _record_success(self, source: RSSSource) -> None:
+        """抓取成功，重設連續失敗次數"""
+        self.health[source.url] = {
+            "consecutive_failures": 0,
+            "last_success_ts": datetime.now(timezone.utc).timestamp(),
+        }
 
-    def fetch_feed(self, source: RSSSource) -> FetchResult:
+    def _error_result(self, source: RSSSource, error_msg: str) -> FetchResult:
+        """記錄並回傳失敗的抓取結果（同時累計該來源的連續失敗次數）"""
+        logger.error(error_msg)
+        state = self.health.setdefault(source.url, {})
+        state["consecutive_failures"] = state.get("consecutive_failures", 0) + 1
+        state["last_failure_ts"] = datetime.now(timezone.utc).timestamp()
+        return FetchResult(
+            source=source.name,
+            success=False,
+            error_message=error_msg,
+        )
+
+    def _download(self, source: RSSSource, cutoff_time: datetime) -> Union[FetchResult, _PendingParse]:
         """
-        抓取單一 RSS Feed
+        下載單一 RSS Feed（網路 I/O，可在多執行緒中呼叫）
 
         Args:
             source: RSS 來源設定
+            cutoff_time: 時間範圍的起點
 
         Returns:
-            FetchResult: 抓取結果
+            需要解析時回傳 _PendingParse；304、內容未變或發生錯誤時直接回傳 FetchResult
         """
+        # 斷路器：長期失敗的來源在冷卻時間內直接略過，不佔用連線與逾時時間
+        if self._circuit_open(source):
+            failures = self.health[source.url]["consecutive_failures"]
+            error_msg = f"Skipping {source.name}: {failures} consecutive failures, waiting for cooldown"
+            logger.warning(error_msg)
+            return FetchResult(source=source.name, success=False, error_message=error_msg)
+
         logger.info(f"Fetching RSS feed: {source.name} ({source.url})")
 
         try:
-            # 使用 requests 先取得內容（處理特殊 headers）
-            response = requests.get(
-                source.url,
-                headers=HTTP_HEADERS,
-                timeout=30
-            )
+            # 條件式 GET：帶上次的 ETag / Last-Modified，未更新的來源會回 304 且沒有內容
+            cached = self.validators.get(source.url, {})
+            conditional_headers = {}
+            if cached.get("etag"):
+                conditional_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
+            # 使用 requests 先取得內容（特殊 headers 已設定在 Session 上）
+            response = self.session.get(source.url, headers=conditional_headers, timeout=RSS_FETCH_TIMEOUT)
+
+            if response.status_code == 304:
+                cached_items = _load_cached_entries(source)
+                if cached_items is not None:
+                    news_items = self._filter_recent(cached_items, cutoff_time)
+                    logger.info(f"{source.name} not modified, reusing {len(news_items)} cached news items")
+                    self._record_success(source)
+                    return FetchResult(source=source.name, success=True, news_items=news_items)
+
+                # 快取的條目遺失時改為一般 GET
+                response = self.session.get(source.url, timeout=RSS_FETCH_TIMEOUT)
+
             response.raise_for_status()
+            logger.debug(
+                f"{source.name}: {len(response.content)} bytes, "
+                f"Content-Encoding={response.headers.get('Content-Encoding', 'identity')}"
+            )
 
-            # 使用 feedparser 解析
-            feed = feedparser.parse(response.content)
-
-            if feed.bozo and not feed.entries:
-                raise ValueError(f"Feed parsing error: {feed.bozo_exception}")
-
-            # 計算時間範圍
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
-
-            news_items = []
-            for entry in feed.entries:
-                try:
-                    # 解析發布日期
-                    published = self._parse_published_date(entry)
-
-                    # 如果無法解析日期，跳過這條新聞（比假設是今天更安全）
-                    if published is None:
-                        logger.warning(f"Skipping entry with unparsable date: {entry.get('title', 'unknown')[:50]}")
-                        continue
-
-                    # 檢查是否在時間範圍內
-                    if published < cutoff_time:
-                        continue
-
-                    # 取得標題和描述
-                    title = self._clean_html(entry.get('title', ''))
-                    description = self._clean_html(
-                        entry.get('description', '') or
-                        entry.get('summary', '') or
-                        ''
-                    )
-                    link = entry.get('link', '')
-
-                    if not title or not link:
-                        continue
-
-                    # 建立新聞項目
-                    news_item = NewsItem(
-                        title=title,
-                        link=link,
-                        description=description[:500],  # 限制描述長度
-                        published=published,
-                        source=source.name,
-                        source_language=source.language,
-                    )
-
-                    # 去重檢查
-                    if news_item.url_hash not in self.seen_hashes:
-                        self.seen_hashes.add(news_item.url_hash)
-                        news_items.append(news_item)
-
-                except Exception as e:
-                    logger.warning(f"Error parsing entry from {source.name}: {e}")
-                    continue
-
-            logger.info(f"Fetched {len(news_items)} news items from {source.name}")
-
-            return FetchResult(
-                source=source.name,
-                success=True,
-                news_items=news_items,
+            pending = _PendingParse(
+                source=source,
+                body=response.content,
+                body_hash=hashlib.blake2b(response.content, digest_size=16).hexdigest(),
+                content_type=response.headers.get("Content-Type"),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
             )
 
+            # 不支援條件式 GET 的伺服器：內容與上次相同時直接沿用快取，不再解析
+            if cached.get("body_hash") == pending.body_hash:
+                cached_items = _load_cached_entries(source)
+                if cached_items is not None:
+                    logger.debug(f"{source.name} content unchanged, skipping parse")
+                    return self._complete(pending, cached_items, cutoff_time)
+
+            return pending
+
         except requests.RequestException as e:
-            error_msg = f"Network error fetching {source.name}: {e}"
-            logger.error(error_msg)
-            return FetchResult(
-                source=source.name,
-                success=False,
-                error_message=error_msg,
-            )
+            return self._error_result(source, f"Network error fetching {source.name}: {e}")
         except Exception as e:
-            error_msg = f"Error fetching {source.name}: {e}"
-            logger.error(error_msg)
-            return FetchResult(
-                source=source.name,
-                success=False,
-                error_message=error_msg,
+            return self._error_result(source, f"Error fetching {source.name}: {e}")
+
+    def _complete(
+        self, pending: _PendingParse, all_items: List[NewsItem], cutoff_time: datetime
+    ) -> FetchResult:
+        """
+        以解析結果完成抓取：過濾時間範圍並記錄驗證資訊
+
+        Args:
+            pending: 已下載的 feed 內容
+            all_items: 該來源所有新聞項目
+            cutoff_time: 時間範圍的起點
+
+        Returns:
+            FetchResult: 抓取結果
+        """
+        source = pending.source
+        news_items = self._filter_recent(all_items, cutoff_time)
+
+        logger.info(f"Fetched {len(news_items)} news items from {source.name}")
+
+        # 解析成功後才記錄驗證資訊，避免失敗的內容在下次被 304 略過
+        self.validators[source.url] = {
+            "etag": pending.etag,
+            "last_modified": pending.last_modified,
+            "body_hash": pending.body_hash,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._record_success(source)
+
+        return FetchResult(
+            source=source.name,
+            success=True,
+            news_items=news_items,
+        )
+
+    def _collect(
+        self, pending: _PendingParse, parse: Callable[[], List[NewsItem]], cutoff_time: datetime
+    ) -> FetchResult:
+        """執行（或等待）解析並完成抓取，解析失敗時回傳錯誤結果"""
+        try:
+            all_items = parse()
+        except Exception as e:
+            return self._error_result(pending.source, f"Error fetching {pending.source.name}: {e}")
+
+        _save_cached_entries(pending.source, all_items)
+        return self._complete(pending, all_items, cutoff_time)
+
+    def _parse_pending(self, pending: List[_PendingParse], cutoff_time: datetime) -> List[FetchResult]:
+        """
+        解析已下載的 feed（CPU 密集）
+
+        待解析的來源超過 RSS_PARSE_PROCESS_MIN_FEEDS 時以多行程平行解析，避開 GIL；
+        數量少時行程啟動與序列化的成本高於收益，直接在本行程解析
+
+        Args:
+            pending: 已下載的 feed 內容
+            cutoff_time: 時間範圍的起點
+
+        Returns:
+            List[FetchResult]: 與 pending 順序相同的抓取結果
+        """
+        if len(pending) > RSS_PARSE_PROCESS_MIN_FEEDS:
+            max_workers = min(len(pending), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(_parse_feed, item.body, item.source, item.content_type)
+                    for item in pending
+                ]
+                return [
+                    self._collect(item, future.result, cutoff_time)
+                    for item, future in zip(pending, futures)
+                ]
+
+        return [
+            self._collect(
+                item,
+                partial(_parse_feed, item.body, item.source, item.content_type),
+                cutoff_time,
             )
+            for item in pending
+        ]
+
+    def fetch_feed(self, source: RSSSource) -> FetchResult:
+        """
+        抓取單一 RSS Feed（可在多執行緒中呼叫，跨來源去重由 fetch_all 負責）
+
+        Args:
+            source: RSS 來源設定
+
+        Returns:
+            FetchResult: 抓取結果
+        """
+        cutoff_time = self._cutoff_time()
+        downloaded = self._download(source, cutoff_time)
+        if isinstance(downloaded, FetchResult):
+            return downloaded
+        return self._collect(
+            downloaded,
+            partial(_parse_feed, downloaded.body, source, downloaded.content_type),
+            cutoff_time,
+        )
 
     def fetch_all(self) -> Tuple[List[NewsItem], List[str]]:
         """
@@ -305,16 +716,40 @@ class RSSFetcher:
         all_news: List[NewsItem] = []
         errors: List[str] = []
 
-        for source in RSS_FEEDS:
-            result = self.fetch_feed(source)
+        # 所有來源共用同一個時間範圍起點，結果不受各來源下載先後影響
+        cutoff_time = self._cutoff_time()
 
-            if result.success:
-                all_news.extend(result.news_items)
-            else:
+        # 下載皆為網路 I/O，以執行緒平行處理；map 依 RSS_FEEDS 順序回傳結果
+        max_workers = max(1, min(RSS_FETCH_MAX_WORKERS, len(RSS_FEEDS)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            downloads = list(executor.map(partial(self._download, cutoff_time=cutoff_time), RSS_FEEDS))
+
+        # 解析為 CPU 工作，另外分批處理後依原順序放回
+        pending = [item for item in downloads if isinstance(item, _PendingParse)]
+        parsed = iter(self._parse_pending(pending, cutoff_time))
+        results = [
+            item if isinstance(item, FetchResult) else next(parsed)
+            for item in downloads
+        ]
+        _save_json(_VALIDATORS_FILE, self.validators)
+        _save_json(_HEALTH_FILE, self.health)
+
+        seen_hashes = self.seen_hashes
+        new_hashes = self.new_hashes
+        for result in results:
+            if not result.success:
                 errors.append(result.error_message)
+                continue
+
+            # 去重檢查（在主執行緒依來源順序進行，結果與循序抓取相同；前幾天已收錄的也略過）
+            for news_item in result.news_items:
+                if news_item.url_hash not in seen_hashes:
+                    seen_hashes.add(news_item.url_hash)
+                    new_hashes.append(news_item.url_hash)
+                    all_news.append(news_item)
 
         # 按發布時間排序（最新的在前）
-        all_news.sort(key=lambda x: x.published, reverse=True)
+        all_news.sort(key=_PUBLISHED_KEY, reverse=True)
 
         logger.info(f"Total fetched: {len(all_news)} news items, {len(errors)} errors")
 
@@ -332,22 +767,22 @@ class RSSFetcher:
         """
         all_news, errors = self.fetch_all()
 
-        # 計算初步優先級並轉換為字典
-        news_with_priority = []
-        for news in all_news:
-            priority, category = self._calculate_preliminary_priority(
-                news.title, news.description
-            )
+        # 計算初步優先級
+        scored = [
+            (*self._calculate_preliminary_priority(news.search_text), news)
+            for news in all_news
+        ]
+
+        # 按優先級取前 max_items 則（部分選取；同分時維持原本較新在前的順序）
+        top_news = heapq.nlargest(max_items, scored, key=_PRIORITY_KEY)
+
+        # 只有選中的新聞才轉換為字典
+        selected_news = []
+        for priority, category, news in top_news:
             news_dict = news.to_dict()
             news_dict['preliminary_priority'] = priority
             news_dict['preliminary_category'] = category
-            news_with_priority.append(news_dict)
-
-        # 按優先級排序
-        news_with_priority.sort(key=lambda x: x['preliminary_priority'], reverse=True)
-
-        # 限制數量
-        selected_news = news_with_priority[:max_items]
+            selected_news.append(news_dict)
 
         logger.info(f"Selected {len(selected_news)} news items for analysis")
 
@@ -364,22 +799,10 @@ def format_news_for_gemini(news_items: List[Dict]) -> str:
     Returns:
         str: 格式化的新聞文字
     """
-    formatted = []
-
-    for i, news in enumerate(news_items, 1):
-        formatted.append(f"""
----
-【新聞 {i}】
-標題: {news['title']}
-來源: {news['source']}
-語言: {news['source_language']}
-發布時間: {news['published']}
-連結: {news['link']}
-摘要: {news['description']}
----
-""")
-
-    return "\n".join(formatted)
+    return "\n\n".join(
+        _GEMINI_NEWS_TEMPLATE.format(index=i, **news)
+        for i, news in enumerate(news_items, 1)
+    )
 
 
 def format_titles_for_ranking(news_items: List[Dict]) -> str:
@@ -392,16 +815,23 @@ def format_titles_for_ranking(news_items: List[Dict]) -> str:
     Returns:
         str: 格式化的標題列表
     """
-    lines = []
-    for i, news in enumerate(news_items):
-        lines.append(f"[{i}] {news['title']}")
-    return "\n".join(lines)
+    return "\n".join(f"[{i}] {news['title']}" for i, news in enumerate(news_items))
 
 
 if __name__ == "__main__":
     # 測試用
     logging.basicConfig(level=logging.INFO)
 
+    # 日期解析回歸檢查：時間後的 PM 不可被 RFC 822 解析忽略（應為 16:04，而非 04:04）
+    for raw_date in (
+        "Fri, 23 Jan 2026 4:04 PM +0000",
+        "23 Jan 2026 4:04 PM EST",
+        "Fri, 23 Jan 2026 04:04 pm GMT",
+        "Jan 23, 2026 4:04 PM",
+    ):
+        parsed_date = _parse_custom_date(raw_date)
+        assert parsed_date is not None and parsed_date.hour == 16, f"{raw_date!r} -> {parsed_date}"
+
     fetcher = RSSFetcher(lookback_hours=48)  # 測試時抓取 48 小時
     news, errors = fetcher.fetch_and_prioritize(max_items=10)
 